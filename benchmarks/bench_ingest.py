@@ -0,0 +1,199 @@
+"""Ingestion throughput benchmark.
+
+Replays recorded date-index and press-release HTML fixtures through the
+ingest path (consolidate_news_urls -> parse_press_release -> NewsExtractor
+-> DocumentGenerator.generate_documents -> ChromaDBHandler.add_documents_to_chromadb)
+against a local fake Ollama, with all stores in a temporary directory.
+
+    python -m benchmarks.bench_ingest --articles 200 --days 5
+
+Fixtures are parsed by the crawler's own HttpFetcher parsers. Pages saved
+from info.gov.hk with benchmarks/record_fixtures.py --replace take the place
+of the bundled ones.
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_ollama import FakeOllama
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+BASE_URL = "https://www.info.gov.hk"
+STAGES = ["discover", "parse", "extract", "generate", "upsert"]
+
+
+def load_fixture(name: str, url: str, replacements: dict[str, str] | None = None):
+    from tools.HttpFetcher import PAGE_PARSERS
+
+    html = (FIXTURES / name).read_text(encoding="utf-8")
+    for old, new in (replacements or {}).items():
+        html = html.replace(old, new)
+
+    # the same lxml parsers the crawler runs on fetched pages.
+    page = PAGE_PARSERS["date" if name.startswith("date_index_") else "news"](url, html)
+    if not page.success:
+        raise ValueError(f"fixture {name}: {page.error_message}")
+
+    return page
+
+
+def percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+# ru_maxrss is in bytes on macOS and in kilobytes on Linux.
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def configure_environment(workdir: str, ollama_url: str) -> None:
+    os.makedirs(os.path.join(workdir, "logs"), exist_ok=True)
+    os.environ.update({
+        "logpath": os.path.join(workdir, "logs"),
+        "log_level": "WARNING",
+        "ollama_base_url": ollama_url,
+        "provider": "ollama/fake-llm",
+        "ollama_embedding_model": "fake-embed",
+        "collection_name": "Bench_News_Collection",
+        "chromadb_path": os.path.join(workdir, "chroma"),
+        "crawl_ledger_path": os.path.join(workdir, "crawl_ledger.db"),
+        "embedding_cache_path": os.path.join(workdir, "embedding_cache.db"),
+        "lexical_index_path": os.path.join(workdir, "lexical_index.db"),
+        "article_store_path": os.path.join(workdir, "article_store.db"),
+        "rollup_store_path": os.path.join(workdir, "rollups.db")
+    })
+
+
+def run(articles: int, days: int) -> dict:
+    # imported after the environment points every store at the temporary directory.
+    from tools.logger import Logger
+    from tools.DataProcessor import consolidate_news_urls
+    from tools.PressReleaseParser import parse_press_release
+    from tools.NewsExtractor import NewsExtractor
+    from tools.DocumentGenerator import DocumentGenerator
+    from tools.LexicalIndex import LexicalIndex
+    from tools.ArticleStore import ArticleStore
+    from tools.RollupStore import RollupStore
+    from tools.ChromaDBHandler import ChromaDBHandler
+
+    logger = Logger("benchmark").get_logger()
+    extractor = NewsExtractor(logger=logger)
+    document_generator = DocumentGenerator(logger=logger)
+    article_store = ArticleStore(logger=logger)
+    db_handler = ChromaDBHandler(
+        logger=logger,
+        lexical_index=LexicalIndex(logger=logger),
+        article_store=article_store,
+        rollup_store=RollupStore(logger=logger, article_store=article_store)
+    )
+    loop = asyncio.new_event_loop()
+    timings: dict[str, list[float]] = {stage: [] for stage in STAGES}
+    total_chunks = 0
+    started = time.perf_counter()
+
+    # date-index discovery, replaying the recorded day as consecutive days of its month.
+    index_name = sorted(path.name for path in FIXTURES.glob("date_index_*.html"))[-1]
+    recorded = index_name.removeprefix("date_index_").removesuffix(".html")
+    month, day_of_month = recorded[:6], recorded[6:]
+    date_pages = [
+        load_fixture(
+            index_name,
+            f"{BASE_URL}/gia/general/{month}/{day:02d}.htm",
+            {f"{month}/{day_of_month}/P{recorded}": f"{month}/{day:02d}/P{month}{day:02d}"}
+        )
+        for day in range(1, days + 1)
+    ]
+    start = time.perf_counter()
+    news_links = consolidate_news_urls(results=date_pages, logger=logger)
+    timings["discover"].append(time.perf_counter() - start)
+
+    # press releases, cycling through the recorded fixtures with unique ids and text.
+    fixtures = itertools.cycle(sorted(path.name for path in FIXTURES.glob("press_release_*.html")))
+    for i in range(articles):
+        news_id = f"P20260801{i:05d}"
+        page = load_fixture(
+            next(fixtures),
+            f"{BASE_URL}/gia/general/202608/01/{news_id}.htm",
+            {"<span id=\"pressrelease\">": f"<span id=\"pressrelease\">Reference {news_id}.<br><br>"}
+        )
+
+        start = time.perf_counter()
+        release = parse_press_release(url=page.url, title=page.metadata["title"], markdown=page.markdown)
+        timings["parse"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        data = loop.run_until_complete(extractor.extract(content=release.body))
+        timings["extract"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        ids, metadatas, all_splits, article = document_generator.generate_documents(data=data, release=release)
+        timings["generate"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        db_handler.add_documents_to_chromadb(ids=ids, documents=all_splits, metadatas=metadatas, articles=[article])
+        timings["upsert"].append(time.perf_counter() - start)
+        total_chunks += len(ids)
+
+    elapsed = time.perf_counter() - started
+    loop.close()
+
+    return {
+        "articles": articles,
+        "chunks": total_chunks,
+        "news_links": len(news_links),
+        "elapsed_s": elapsed,
+        "articles_per_s": articles / elapsed,
+        "chunks_per_s": total_chunks / elapsed,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": {
+            stage: {
+                "count": len(values),
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "total_s": sum(values)
+            }
+            for stage, values in timings.items()
+        }
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"articles: {report['articles']}  chunks: {report['chunks']}  discovered links: {report['news_links']}")
+    print(f"elapsed: {report['elapsed_s']:.2f}s  articles/s: {report['articles_per_s']:.1f}  chunks/s: {report['chunks_per_s']:.1f}  peak RSS: {report['peak_rss_mb']:.1f} MB")
+    print(f"{'stage':<10}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'total s':>10}")
+    for stage, stats in report["stages"].items():
+        print(f"{stage:<10}{stats['count']:>8}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['total_s']:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the ingest path against recorded fixtures and a fake Ollama.")
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--json", help="write the report to this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir, FakeOllama() as ollama:
+        configure_environment(workdir=workdir, ollama_url=ollama.url)
+        report = run(articles=args.articles, days=args.days)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    return
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Startup time benchmark.
+
+Starts fresh interpreters that import and construct MediaAgent (what main.py
+does before the first prompt), then builds the components a query session
+touches first (response cache, planner, retriever). Reports wall time per
+phase and which heavy packages ended up imported, with all stores in a
+temporary directory.
+
+    python -m benchmarks.bench_startup --runs 5
+"""
+from pathlib import Path
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.bench_ingest import configure_environment, percentile
+
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ["crawl4ai", "playwright", "chromadb", "langchain_classic", "langchain_community", "langchain_ollama"]
+
+# runs in a fresh interpreter so every import is cold.
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from tools.MediaAgent import MediaAgent
+imported = time.perf_counter()
+agent = MediaAgent()
+constructed = time.perf_counter()
+startup_modules = [name for name in HEAVY if name in sys.modules]
+query = None
+if QUERY:
+    agent.response_cache
+    agent.planner
+    agent.retriever
+    query = time.perf_counter() - constructed
+print(json.dumps({
+    "import_s": imported - started,
+    "construct_s": constructed - imported,
+    "startup_s": constructed - started,
+    "first_query_components_s": query,
+    "startup_modules": startup_modules,
+    "session_modules": [name for name in HEAVY if name in sys.modules]
+}))
+"""
+
+
+def run_probe(query: bool) -> dict:
+    code = f"HEAVY = {HEAVY_MODULES!r}\nQUERY = {query!r}\n{PROBE}"
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run(runs: int, query: bool) -> dict:
+    samples = [run_probe(query=query) for _ in range(runs)]
+    report = {"runs": runs, "phases": {}}
+    for phase in ["import_s", "construct_s", "startup_s"] + (["first_query_components_s"] if query else []):
+        values = [sample[phase] for sample in samples]
+        report["phases"][phase] = {
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "mean_ms": statistics.fmean(values) * 1000
+        }
+    report["startup_modules"] = samples[-1]["startup_modules"]
+    report["session_modules"] = samples[-1]["session_modules"]
+
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(f"runs: {report['runs']}")
+    print(f"{'phase':<28}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for phase, stats in report["phases"].items():
+        print(f"{phase.removesuffix('_s'):<28}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['mean_ms']:>10.1f}")
+    print(f"heavy modules after startup: {', '.join(report['startup_modules']) or 'none'}")
+    print(f"heavy modules after first query components: {', '.join(report['session_modules']) or 'none'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MediaAgent startup in fresh interpreters.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-query", action="store_true", help="only measure import and construction")
+    parser.add_argument("--json", help="write the report to this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        configure_environment(workdir=workdir, ollama_url="http://127.0.0.1:9")
+        os.environ.update({
+            "response_cache_path": os.path.join(workdir, "response_cache.db"),
+            "report_cache_path": os.path.join(workdir, "report_cache.db"),
+            "raw_page_store_path": os.path.join(workdir, "raw_pages.db"),
+            "watch_status_path": os.path.join(workdir, "watch_status.json")
+        })
+        report = run(runs=args.runs, query=not args.no_query)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    return
+
+
+if __name__ == "__main__":
+    sys.exit(main())
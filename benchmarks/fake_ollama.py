@@ -0,0 +1,88 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import hashlib
+import json
+import re
+import struct
+import threading
+
+
+# deterministic stand-in for the ollama endpoints used by the ingest path.
+EMBEDDING_DIM = 768
+WORD_PATTERN = re.compile(r"[A-Z][A-Za-z]+(?: [A-Z][A-Za-z]+)*")
+
+
+def fake_embedding(text: str) -> list[float]:
+    values = []
+    seed = hashlib.sha256(text.encode("utf-8")).digest()
+    while len(values) < EMBEDDING_DIM:
+        seed = hashlib.sha256(seed).digest()
+        values.extend(v / 2**31 for v in struct.unpack("8i", seed))
+
+    return values[:EMBEDDING_DIM]
+
+
+def fake_extraction(text: str) -> dict:
+    names = list(dict.fromkeys(WORD_PATTERN.findall(text)))
+    return {
+        "keywords": [name.lower() for name in names[:5]],
+        "organizations": [name for name in names if len(name.split()) > 1][:5],
+        "summary": " ".join(text.split()[:120])
+    }
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        return
+
+    def _send(self, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        model = request.get("model", "fake")
+        if self.path == "/api/embed":
+            inputs = request.get("input", [])
+            inputs = [inputs] if isinstance(inputs, str) else inputs
+            self._send({"model": model, "embeddings": [fake_embedding(text) for text in inputs]})
+        elif self.path == "/api/embeddings":
+            self._send({"embedding": fake_embedding(request.get("prompt", ""))})
+        elif self.path == "/api/chat":
+            content = request["messages"][-1]["content"]
+            self._send({
+                "model": model,
+                "created_at": "2026-01-01T00:00:00Z",
+                "message": {"role": "assistant", "content": json.dumps(fake_extraction(content))},
+                "done": True
+            })
+        else:
+            self.send_error(404)
+
+
+class FakeOllama:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.server = ThreadingHTTPServer((host, port), FakeOllamaHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    with FakeOllama(port=11435) as server:
+        print(f"Fake Ollama serving on {server.url}")
+        server.thread.join()
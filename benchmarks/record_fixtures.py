@@ -0,0 +1,69 @@
+"""Record benchmark fixtures from info.gov.hk.
+
+Saves one daily index page and the first press releases it links to into
+benchmarks/fixtures, as date_index_YYYYMMDD.html and
+press_release_<news id>.html, so bench_ingest replays real pages.
+
+    python -m benchmarks.record_fixtures --date 20260801 --articles 6 --replace
+"""
+from datetime import date, timedelta
+from urllib.parse import urlparse
+import argparse
+import re
+import sys
+
+import httpx
+
+from benchmarks.bench_ingest import BASE_URL, FIXTURES
+
+
+NEWS_PATH = re.compile(r"/gia/general/\d{6}/\d{2}/(P\d+)\.htm$")
+
+
+def record(day: str, articles: int, replace: bool) -> list[str]:
+    # parsed with the crawler's parsers, so a page the benchmark cannot read is never saved.
+    from tools.HttpFetcher import parse_date_page, parse_news_page
+
+    date_url = f"{BASE_URL}/gia/general/{day[:6]}/{day[6:]}.htm"
+    with httpx.Client(timeout=20, follow_redirects=True, headers={"User-Agent": "Mozilla/5.0 (compatible; GovMediaSummary/0.1)"}) as client:
+        response = client.get(date_url)
+        response.raise_for_status()
+        date_page = parse_date_page(date_url, response.content)
+        if not date_page.success:
+            raise ValueError(f"{date_url}: {date_page.error_message}")
+
+        news_urls = list(dict.fromkeys(
+            link["href"] for link in date_page.links["internal"] if NEWS_PATH.search(urlparse(link["href"]).path)
+        ))[:articles]
+        pages = {f"date_index_{day}.html": response.content}
+        for url in news_urls:
+            news_response = client.get(url)
+            news_response.raise_for_status()
+            if not parse_news_page(url, news_response.content).success:
+                continue
+            pages[f"press_release_{NEWS_PATH.search(urlparse(url).path).group(1)}.html"] = news_response.content
+
+    if replace:
+        for path in [*FIXTURES.glob("date_index_*.html"), *FIXTURES.glob("press_release_*.html")]:
+            path.unlink()
+    for name, content in pages.items():
+        (FIXTURES / name).write_bytes(content)
+
+    return list(pages)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Save info.gov.hk pages as bench_ingest fixtures.")
+    parser.add_argument("--date", default=(date.today() - timedelta(days=1)).strftime("%Y%m%d"), help="day to record, YYYYMMDD")
+    parser.add_argument("--articles", type=int, default=6)
+    parser.add_argument("--replace", action="store_true", help="remove the existing fixtures first")
+    args = parser.parse_args()
+
+    for name in record(day=args.date, articles=args.articles, replace=args.replace):
+        print(f"saved {FIXTURES / name}")
+
+    return
+
+
+if __name__ == "__main__":
+    sys.exit(main())
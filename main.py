@@ -1,11 +1,91 @@
-
 from tools.MediaAgent import MediaAgent
 
+from datetime import datetime
+import argparse
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Hong Kong Government press release media agent.")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    # backfill a date range in day/week units with checkpoint/resume.
+    backfill = subparsers.add_parser("backfill", help="crawl and ingest a date range in parallel units, resuming from the last checkpoint")
+    backfill.add_argument("--start", required=True, help="start date in YYYYMMDD format")
+    backfill.add_argument("--end", required=True, help="end date in YYYYMMDD format")
+    backfill.add_argument("--unit", choices=["day", "week"], default="week")
+    backfill.add_argument("--workers", type=int, default=None, help="number of units crawled concurrently")
+    backfill.add_argument("--fresh", action="store_true", help="ignore the existing checkpoint")
+    
+    # re-run pages that failed after all retries.
+    subparsers.add_parser("retry-dead-letters", help="re-crawl date and news pages on the dead-letter list")
+    
+    # rebuild chunks or summaries from the raw page store, without network access.
+    reprocess = subparsers.add_parser("reprocess", help="re-chunk (and optionally re-summarise) stored press releases")
+    reprocess.add_argument("--start", default=None, help="start date in YYYYMMDD format")
+    reprocess.add_argument("--end", default=None, help="end date in YYYYMMDD format")
+    reprocess.add_argument("--reextract", action="store_true", help="also re-run LLM extraction instead of reusing stored summaries")
+    
+    # long-running daemon that keeps recent days ingested.
+    watch = subparsers.add_parser("watch", help="poll today's press release index and ingest new releases as they appear")
+    watch.add_argument("--interval", type=float, default=None, help="seconds between polls")
+    watch.add_argument("--health-port", type=int, default=None, help="serve /health and /metrics on this port (0 to disable)")
+    
+    # grouped summary report from stored per-article summaries.
+    report = subparsers.add_parser("report", help="write a grouped media summary report for a date range")
+    report.add_argument("--start", required=True, help="start date in YYYYMMDD format")
+    report.add_argument("--end", required=True, help="end date in YYYYMMDD format")
+    report.add_argument("--group-by", choices=["organization", "topic"], default="organization")
+    
+    # per-month (or year) chromadb partitions.
+    partitions = subparsers.add_parser("partitions", help="list, archive, restore or drop chromadb partitions")
+    partitions.add_argument("action", choices=["list", "archive", "restore", "drop"])
+    partitions.add_argument("--before", default=None, help="archive or drop partitions ending before this YYYYMM (or YYYY) key")
+    partitions.add_argument("--key", default=None, help="partition key to restore, e.g. 202401")
+    
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     
     # initiate MediaAgent Object.
     Agent = MediaAgent()
-    Agent.chat_loop()
+    
+    if args.command == "backfill":
+        Agent.backfill_scheduler.backfill(
+            startDate=args.start,
+            endDate=args.end,
+            unit=args.unit,
+            workers=args.workers,
+            fresh=args.fresh
+        )
+    elif args.command == "retry-dead-letters":
+        Agent.Crawler.retry_dead_letters()
+    elif args.command == "reprocess":
+        Agent.Crawler.reprocess(startDate=args.start, endDate=args.end, reextract=args.reextract)
+    elif args.command == "watch":
+        Agent.watcher.watch(interval=args.interval, health_port=args.health_port)
+    elif args.command == "report":
+        result = Agent.report_engine.generate_report(
+            start_date=datetime.strptime(args.start, "%Y%m%d").strftime("%B %d, %Y"),
+            end_date=datetime.strptime(args.end, "%Y%m%d").strftime("%B %d, %Y"),
+            group_by=args.group_by
+        )
+        print(result)
+    elif args.command == "partitions":
+        if (args.action == "restore" and not args.key) or (args.action in ("archive", "drop") and not args.before):
+            raise SystemExit(f"partitions {args.action} needs {'--key' if args.action == 'restore' else '--before'}.")
+        if args.action == "list":
+            result = Agent.DBHandler.list_partitions()
+        elif args.action == "restore":
+            result = Agent.DBHandler.restore_partition(key=args.key)
+        elif args.action == "archive":
+            result = Agent.DBHandler.archive_partitions(before=args.before)
+        else:
+            result = Agent.DBHandler.drop_partitions(before=args.before)
+        print(result)
+    else:
+        Agent.chat_loop()
     
     return
         
@@ -0,0 +1,55 @@
+from unittest import mock
+import importlib.util
+import logging
+import os
+import tempfile
+import unittest
+
+from tools.CrawlLedger import CrawlLedger, STATUS_EXTRACTED, STATUS_INGESTED, STATUS_NOT_FOUND
+
+
+BASE_URL = "https://www.info.gov.hk/gia/general"
+FOUND = f"{BASE_URL}/202608/01/P2026080100123.htm"
+NOT_FOUND = f"{BASE_URL}/202608/01/P2026080100402.htm"
+
+
+class CrawlLedgerNotFoundTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        with mock.patch.dict(os.environ, {"crawl_ledger_path": os.path.join(self.workdir.name, "crawl_ledger.db")}):
+            self.ledger = CrawlLedger(logger=logging.getLogger(__name__))
+        self.addCleanup(self.ledger.conn.close)
+
+        # a complete day with one ingested and one withdrawn press release.
+        self.ledger.record_date_page(page_date="20260801", url=f"{BASE_URL}/202608/01.htm", news_links=[FOUND, NOT_FOUND], complete=True)
+        self.ledger.mark(news_id="P2026080100123", url=FOUND, status=STATUS_EXTRACTED, text="body")
+        self.ledger.mark_ingested(["P2026080100123"])
+        self.ledger.mark(news_id="P2026080100402", url=NOT_FOUND, status=STATUS_NOT_FOUND)
+
+
+    def test_not_found_is_pending_by_default(self):
+        self.assertEqual(self.ledger.filter_pending(["P2026080100123", "P2026080100402"]), ["P2026080100402"])
+
+
+    def test_not_found_is_done_when_requested(self):
+        pending = self.ledger.filter_pending(["P2026080100123", "P2026080100402"], done_statuses=(STATUS_INGESTED, STATUS_NOT_FOUND))
+        self.assertEqual(pending, [])
+        self.assertEqual(self.ledger.unfinished_days(["20260801"]), [])
+
+
+    @unittest.skipUnless(importlib.util.find_spec("httpx"), "the crawler needs httpx")
+    def test_complete_day_does_not_requeue_not_found(self):
+        from tools.NewsCrawler import NewsCrawler
+
+        crawler = object.__new__(NewsCrawler)
+        crawler.logger = logging.getLogger(__name__)
+        crawler.ledger = self.ledger
+        poll_urls, news_urls = crawler._plan_date_pages(urls=[f"{BASE_URL}/202608/01.htm"])
+
+        self.assertEqual(poll_urls, [])
+        self.assertEqual(news_urls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
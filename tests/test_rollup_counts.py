@@ -0,0 +1,95 @@
+from datetime import date, datetime
+from unittest import mock
+import logging
+import os
+import tempfile
+import unittest
+
+from tools.RollupStore import RollupStore
+from tools.QueryPlanner import QueryPlanner, Instruction
+
+
+def article(news_id: str, day: date, organizations: list[str]) -> dict:
+    return {
+        "news_id": news_id,
+        "pub_date": int(datetime.combine(day, datetime.min.time()).timestamp()),
+        "keywords": [],
+        "organizations": organizations
+    }
+
+
+class EmptyArticleStore:
+    def count(self) -> int:
+        return 0
+
+
+class NoCrawler:
+    def fetch_missing_dates(self, **kwargs):
+        raise AssertionError("count questions must not crawl")
+
+
+class RollupCountTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        with mock.patch.dict(os.environ, {"rollup_store_path": os.path.join(self.workdir.name, "rollups.db")}):
+            self.rollup_store = RollupStore(logger=logging.getLogger(__name__), article_store=EmptyArticleStore())
+        self.addCleanup(self.rollup_store.conn.close)
+
+        # the range also holds releases of other organizations.
+        self.rollup_store.apply(articles=[
+            article("P2026080100123", date(2026, 8, 1), ["Labour Department"]),
+            article("P2026080100245", date(2026, 8, 1), ["Department of Health"]),
+            article("P2026080200311", date(2026, 8, 2), ["Department of Health", "Customs and Excise Department"]),
+            article("P2026080200402", date(2026, 8, 2), [])
+        ])
+
+        self.planner = object.__new__(QueryPlanner)
+        self.planner.logger = logging.getLogger(__name__)
+        self.planner.crawler = NoCrawler()
+        self.planner.rollup_store = self.rollup_store
+        self.planner.max_range_days = 31
+
+
+    def plan(self, organizations: list[str]) -> Instruction:
+        return Instruction(
+            intent="count",
+            start_date=date(2026, 8, 1),
+            end_date=date(2026, 8, 2),
+            topic=None,
+            organizations=organizations,
+            group_by=None,
+            interval=None,
+            action="count press releases"
+        )
+
+
+    def test_total_counts_only_matching_releases(self):
+        window = {"start_date": "August 01, 2026", "end_date": "August 02, 2026"}
+
+        self.assertEqual(self.rollup_store.aggregate_records(**window, group_by="all")["total"], 4)
+        self.assertEqual(self.rollup_store.aggregate_records(**window, group_by="organization", name="Labour Department")["total"], 1)
+        self.assertEqual(self.rollup_store.aggregate_records(**window, group_by="organization", name="Department of Health")["total"], 2)
+        # a release in two matching groups is counted once.
+        self.assertEqual(self.rollup_store.aggregate_records(**window, group_by="organization", name="Department")["total"], 3)
+
+
+    def test_planner_reports_the_organization_count_without_crawling(self):
+        instruction = self.plan(["Labour Department"])
+        with mock.patch.object(QueryPlanner, "plan", return_value=instruction):
+            result, _ = self.planner.try_answer(query="How many Labour Department press releases on August 1-2, 2026?")
+
+        self.assertTrue(result["output"].startswith("aggregate_records returned 1 results"))
+
+
+    def test_planner_reports_each_organization_count(self):
+        instruction = self.plan(["Labour Department", "Department of Health"])
+        with mock.patch.object(QueryPlanner, "plan", return_value=instruction):
+            result, _ = self.planner.try_answer(query="How many releases from the Labour Department and the Department of Health?")
+
+        self.assertIn("1 results for 'Labour Department'", result["output"])
+        self.assertIn("2 results for 'Department of Health'", result["output"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import sqlite3
+import threading
+import json
+from datetime import datetime
+
+import os
+
+
+ARTICLE_FIELDS = ["news_id", "url", "title", "pub_date", "pub_time", "summary", "keywords", "organizations", "ingested_at"]
+JSON_FIELDS = {"keywords", "organizations"}
+
+
+class ArticleStore:
+    def __init__(self, logger):
+        self.logger = logger
+
+        # article store config.
+        self.store_path = os.getenv("article_store_path", "./article_store.db")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.store_path, check_same_thread=False)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                news_id TEXT PRIMARY KEY,
+                url TEXT,
+                title TEXT,
+                pub_date INTEGER,
+                pub_time TEXT,
+                summary TEXT,
+                keywords TEXT,
+                organizations TEXT,
+                ingested_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_pub_date ON articles (pub_date);
+            CREATE INDEX IF NOT EXISTS idx_articles_ingested_at ON articles (ingested_at);
+            """
+        )
+        # stores written before first_ingested_at existed start from their last ingestion time.
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(articles)")}
+        if "first_ingested_at" not in columns:
+            self.conn.execute("ALTER TABLE articles ADD COLUMN first_ingested_at TEXT")
+            self.conn.execute("UPDATE articles SET first_ingested_at = ingested_at")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_first_ingested_at ON articles (first_ingested_at)")
+        self.conn.commit()
+        self.logger.info(f"{ArticleStore.__name__} initiated.")
+
+
+    def _to_row(self, article: dict) -> tuple:
+        return tuple(
+            json.dumps(article.get(field) or [], ensure_ascii=False) if field in JSON_FIELDS else article.get(field)
+            for field in ARTICLE_FIELDS
+        )
+
+
+    def _from_row(self, row: tuple) -> dict:
+        return {
+            field: json.loads(value) if field in JSON_FIELDS and value else value
+            for field, value in zip(ARTICLE_FIELDS, row)
+        }
+
+
+    def count(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+    def upsert_articles(self, articles: list[dict]) -> None:
+        if not articles:
+            return
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = [self._to_row({**article, "ingested_at": now}) for article in articles]
+        placeholders = ",".join("?" * len(ARTICLE_FIELDS))
+        updates = ",".join(f"{field} = excluded.{field}" for field in ARTICLE_FIELDS[1:])
+        # first_ingested_at is only set on insert, so re-ingesting a press release keeps its first ingestion time.
+        with self.lock:
+            self.conn.executemany(
+                f"""
+                INSERT INTO articles ({','.join(ARTICLE_FIELDS)}, first_ingested_at) VALUES ({placeholders}, ?)
+                ON CONFLICT(news_id) DO UPDATE SET {updates}
+                """,
+                [(*row, now) for row in rows]
+            )
+            self.conn.commit()
+        self.logger.debug("%s: upserted %d articles.", ArticleStore.__name__, len(rows))
+
+        return
+
+
+    def get_articles(self, news_ids: list[str]) -> dict[str, dict]:
+        if not news_ids:
+            return {}
+        articles = {}
+        with self.lock:
+            for i in range(0, len(news_ids), 500):
+                batch = news_ids[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.conn.execute(
+                    f"SELECT {','.join(ARTICLE_FIELDS)} FROM articles WHERE news_id IN ({placeholders})",
+                    batch
+                ).fetchall()
+                articles.update({row[0]: self._from_row(row) for row in rows})
+
+        return articles
+
+
+    # news ids newest first, optionally filtered by date range and a keyword in the article fields.
+    def search_news_ids(self, keyword: str | None = None, start_unix: int | None = None, end_unix: int | None = None) -> list[str]:
+        conditions, params = [], []
+        if start_unix is not None:
+            conditions.append("pub_date >= ?")
+            params.append(start_unix)
+        if end_unix is not None:
+            conditions.append("pub_date <= ?")
+            params.append(end_unix)
+        if keyword:
+            conditions.append("(summary LIKE ? OR title LIKE ? OR keywords LIKE ? OR organizations LIKE ?)")
+            params.extend([f"%{keyword}%"] * 4)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT news_id FROM articles {where} ORDER BY pub_date DESC, news_id DESC",
+                params
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+
+    # articles ingested for the first time at or after an ISO timestamp; re-ingested ones are left out.
+    def first_ingested_since(self, since: str) -> list[dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT {','.join(ARTICLE_FIELDS)}, first_ingested_at FROM articles WHERE first_ingested_at >= ? ORDER BY first_ingested_at",
+                (since,)
+            ).fetchall()
+
+        return [{**self._from_row(row[:-1]), "first_ingested_at": row[-1]} for row in rows]
+
+
+    # latest ingestion time of articles published in a date range; changes whenever the range gets new articles.
+    def max_ingested_at(self, start_unix: int | None = None, end_unix: int | None = None) -> str | None:
+        conditions, params = [], []
+        if start_unix is not None:
+            conditions.append("pub_date >= ?")
+            params.append(start_unix)
+        if end_unix is not None:
+            conditions.append("pub_date <= ?")
+            params.append(end_unix)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self.lock:
+            row = self.conn.execute(f"SELECT MAX(ingested_at), COUNT(*) FROM articles {where}", params).fetchone()
+
+        return f"{row[0]}|{row[1]}" if row[0] else None
@@ -0,0 +1,121 @@
+from tools.DataProcessor import generate_date_range
+from tools.Metrics import metrics
+
+from datetime import datetime, timedelta
+import asyncio
+import json
+
+import os
+
+
+def shard_date_range(startDate: str, endDate: str, unit: str) -> list[tuple[str, str]]:
+    if unit not in ("day", "week"):
+        raise ValueError(f"Unsupported backfill unit '{unit}', expected 'day' or 'week'.")
+    step = timedelta(days=1 if unit == "day" else 7)
+    start = datetime.strptime(startDate, "%Y%m%d")
+    end = datetime.strptime(endDate, "%Y%m%d")
+
+    shards = []
+    current = start
+    while current <= end:
+        shard_end = min(current + step - timedelta(days=1), end)
+        shards.append((current.strftime("%Y%m%d"), shard_end.strftime("%Y%m%d")))
+        current = shard_end + timedelta(days=1)
+
+    return shards
+
+
+class BackfillScheduler:
+    def __init__(self, logger, crawler):
+        self.logger = logger
+        self.crawler = crawler
+
+        # backfill config.
+        self.checkpoint_path = os.getenv("backfill_checkpoint_path", "./backfill_checkpoint.json")
+        self.workers = int(os.getenv("backfill_workers", "2"))
+
+        self.logger.info(f"{BackfillScheduler.__name__} initiated.")
+
+
+    # checkpoint of completed units, e.g. "20260801-20260807".
+    def _load_checkpoint(self) -> set[str]:
+        if not os.path.exists(self.checkpoint_path):
+            return set()
+        with open(self.checkpoint_path, "r", encoding="utf-8") as file:
+            return set(json.load(file).get("completed", []))
+
+
+    def _save_checkpoint(self, completed: set[str]) -> None:
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"completed": sorted(completed), "updated_at": datetime.now().isoformat(timespec="seconds")}, file, indent=2)
+        # atomic replace, so a crash never leaves a half-written checkpoint.
+        os.replace(tmp_path, self.checkpoint_path)
+
+
+    async def run(self, startDate: str, endDate: str, unit: str = "week", workers: int | None = None, fresh: bool = False) -> dict:
+        completed = set() if fresh else self._load_checkpoint()
+        shards = shard_date_range(startDate=startDate, endDate=endDate, unit=unit)
+        pending = [shard for shard in shards if f"{shard[0]}-{shard[1]}" not in completed]
+        self.logger.info(f"{BackfillScheduler.__name__}: {len(shards)} {unit} units, {len(shards) - len(pending)} already completed, {len(pending)} pending.")
+
+        semaphore = asyncio.Semaphore(workers or self.workers)
+        checkpoint_lock = asyncio.Lock()
+        failed, incomplete = [], []
+
+        # each unit runs its own crawl pipeline (browser context); llm and chroma limits stay shared.
+        async def run_shard(shard_start: str, shard_end: str) -> None:
+            key = f"{shard_start}-{shard_end}"
+            async with semaphore:
+                try:
+                    with metrics.span("backfill_unit"):
+                        await self.crawler.afetch_news_by_dates(startDate=shard_start, endDate=shard_end)
+                except Exception as e:
+                    self.logger.error(f"{BackfillScheduler.__name__}: unit {key} failed: {e}")
+                    metrics.inc("backfill_units_failed")
+                    failed.append(key)
+                    return
+            # the crawl dead-letters pages instead of raising, so only checkpoint days the ledger shows as ingested.
+            unfinished = self.crawler.ledger.unfinished_days(generate_date_range(startDate=shard_start, endDate=shard_end, logger=self.logger))
+            if unfinished:
+                self.logger.warning(
+                    f"{BackfillScheduler.__name__}: unit {key} incomplete, {len(unfinished)} days not fully ingested: {unfinished}. "
+                    "Retry its dead letters or rerun the backfill."
+                )
+                metrics.inc("backfill_units_incomplete")
+                incomplete.append(key)
+                return
+            async with checkpoint_lock:
+                completed.add(key)
+                self._save_checkpoint(completed)
+            metrics.inc("backfill_units_completed")
+            self.logger.info(f"{BackfillScheduler.__name__}: unit {key} completed.")
+
+        await asyncio.gather(*(run_shard(shard_start, shard_end) for shard_start, shard_end in pending))
+
+        return {
+            "units": len(shards),
+            "completed": len(shards) - len(failed) - len(incomplete),
+            "failed": sorted(failed),
+            "incomplete": sorted(incomplete)
+        }
+
+
+    # the http connection pool belongs to this event loop, so close it before asyncio.run tears the loop down.
+    async def _run_and_close(self, **kwargs) -> dict:
+        try:
+            return await self.run(**kwargs)
+        finally:
+            await self.crawler.http_fetcher.aclose()
+
+
+    def backfill(self, startDate: str, endDate: str, unit: str = "week", workers: int | None = None, fresh: bool = False) -> dict:
+        mark = metrics.mark()
+        result = asyncio.run(self._run_and_close(startDate=startDate, endDate=endDate, unit=unit, workers=workers, fresh=fresh))
+
+        summary = metrics.summary_table(since=mark)
+        metrics.export()
+        self.logger.info(f"Backfill {startDate}-{endDate} finished: {result}\n{summary}")
+        print(summary)
+
+        return result
@@ -1,24 +1,36 @@
 import chromadb
-from chromadb.utils.embedding_functions.ollama_embedding_function import OllamaEmbeddingFunction
 
 from tools.DataProcessor import date_to_unix
+from tools.EmbeddingCache import EmbeddingCache, CachedOllamaEmbeddingFunction
+from tools.Metrics import metrics
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from pprint import pformat
 from datetime import datetime, date, time
-import os
-from dotenv import load_dotenv
-load_dotenv()
+import heapq
+import os, threading
+import time as timer
+
+
+UNDATED_PARTITION = "undated"
+# chroma_partition_by -> strftime format of the partition key; "none" keeps a single collection.
+PARTITION_FORMATS = {"month": "%Y%m", "year": "%Y", "none": None}
 
 
 class ChromaDBHandler:
-    def __init__(self, logger):
+    def __init__(self, logger, lexical_index, article_store, rollup_store):
         self.logger = logger
+        self.lexical_index = lexical_index
+        self.article_store = article_store
+        self.rollup_store = rollup_store
         
         # embedding config.
         self.embedding_model = os.getenv("ollama_embedding_model")
-        self.embedding_function = OllamaEmbeddingFunction(
-            url="http://localhost:11434",
+        self.embedding_cache = EmbeddingCache(logger=self.logger)
+        self.embedding_function = CachedOllamaEmbeddingFunction(
+            cache=self.embedding_cache,
+            url=os.getenv("ollama_base_url", "http://localhost:11434"),
             model_name=self.embedding_model
         )
         
@@ -26,56 +38,528 @@ class ChromaDBHandler:
         self.collection_name = os.getenv("collection_name")
         self.db_path = os.getenv("chromadb_path")
         self.client = chromadb.PersistentClient(path=self.db_path)
-        self.collection = self.client.get_or_create_collection(
-            name=self.collection_name,
-            embedding_function=self.embedding_function,
-            metadata={"description": "Collection to store government press releases."}
-        )
-        self.logger.info(f"{ChromaDBHandler.__name__} initiated.")
+        
+        # partition config: one collection per month (or year) of pub_date, "none" keeps a single collection.
+        self.partition_by = os.getenv("chroma_partition_by", "month")
+        if self.partition_by not in PARTITION_FORMATS:
+            raise ValueError(f"Unsupported chroma_partition_by '{self.partition_by}', expected one of {list(PARTITION_FORMATS)}.")
+        self.partition_format = PARTITION_FORMATS[self.partition_by]
+        self.query_workers = int(os.getenv("chroma_query_workers", "4"))
+        self.archive_path = os.getenv("chromadb_archive_path", f"{self.db_path}_archive")
+        self.archive_client = None
+        self.partition_lock = threading.Lock()
+        self.partitions: dict = {}
+        if self.partition_format is None:
+            self.collection = self._open_collection(client=self.client, name=self.collection_name, create=True)
+        else:
+            for name in (collection.name for collection in self.client.list_collections()):
+                key = name.removeprefix(f"{self.collection_name}_")
+                if name != key and self._is_partition_key(key):
+                    self.partitions[key] = self._open_collection(client=self.client, name=name)
+        
+        # write-behind buffer config.
+        self.flush_size = int(os.getenv("chroma_flush_size", "256"))
+        self.flush_interval = float(os.getenv("chroma_flush_interval", "30"))
+        self.buffer_lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.buffer_ids: list[str] = []
+        self.buffer_documents: list[str] = []
+        self.buffer_metadatas: list[dict] = []
+        self.buffer_articles: list[dict] = []
+        self.last_flush = timer.monotonic()
+        
+        # query result config.
+        self.query_max_limit = int(os.getenv("query_max_limit", "50"))
+        self.chunks_per_article = int(os.getenv("query_chunks_per_article", "5"))
+        self.allowed_fields = ["title", "pub_date", "pub_time", "url", "summary", "keywords", "organizations", "document"]
+        self.default_fields = ["title", "pub_date", "url", "summary"]
+        
+        # split a single collection written before partitioning into partitions.
+        if self.partition_format is not None and self.collection_name in {collection.name for collection in self.client.list_collections()}:
+            self.migrate_to_partitions()
+        # move per-article fields out of chunks stored before the article store existed.
+        if self.article_store.count() == 0 and self.count() > 0:
+            self.migrate_article_metadata()
+        
+        self.logger.info(f"{ChromaDBHandler.__name__} initiated with {len(self._collections())} collections (partitioned by {self.partition_by}).")
+    
+    
+    # partitions.
+    def _open_collection(self, client, name: str, create: bool = False):
+        if create:
+            return client.get_or_create_collection(
+                name=name,
+                embedding_function=self.embedding_function,
+                metadata={"description": "Collection to store government press releases."}
+            )
+        
+        return client.get_collection(name=name, embedding_function=self.embedding_function)
+    
+    
+    def partition_key(self, pub_date: int | None) -> str:
+        if pub_date is None:
+            return UNDATED_PARTITION
+        
+        return datetime.fromtimestamp(pub_date).strftime(self.partition_format)
+    
+    
+    def _is_partition_key(self, key: str) -> bool:
+        if key == UNDATED_PARTITION:
+            return True
+        try:
+            return datetime.strptime(key, self.partition_format).strftime(self.partition_format) == key
+        except ValueError:
+            return False
+    
+    
+    # unix range covered by a partition key; None for the undated partition.
+    def _partition_range(self, key: str) -> tuple[int, int] | None:
+        if key == UNDATED_PARTITION:
+            return None
+        start = datetime.strptime(key, self.partition_format)
+        if self.partition_by == "month":
+            end = start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+        else:
+            end = start.replace(year=start.year + 1)
+        
+        return int(start.timestamp()), int(end.timestamp()) - 1
+    
+    
+    def _partition(self, key: str):
+        with self.partition_lock:
+            if key not in self.partitions:
+                self.partitions[key] = self._open_collection(client=self.client, name=f"{self.collection_name}_{key}", create=True)
+                self.logger.info(f"{ChromaDBHandler.__name__}: created partition {key}.")
+            return self.partitions[key]
+    
+    
+    # collections overlapping a pub_date range; the undated partition only serves unbounded queries.
+    def _collections(self, start_unix: int | None = None, end_unix: int | None = None) -> list:
+        if self.partition_format is None:
+            return [self.collection]
+        with self.partition_lock:
+            partitions = dict(self.partitions)
+        collections = []
+        for key, collection in sorted(partitions.items()):
+            covered = self._partition_range(key)
+            if covered is None:
+                if start_unix is None and end_unix is None:
+                    collections.append(collection)
+                continue
+            if (start_unix is None or covered[1] >= start_unix) and (end_unix is None or covered[0] <= end_unix):
+                collections.append(collection)
+        
+        return collections
+    
+    
+    # collections holding the chunks of the given press releases, located by their pub_date.
+    def _collections_for_news_ids(self, news_ids: list[str], articles: dict[str, dict] | None = None) -> list:
+        if self.partition_format is None:
+            return [self.collection]
+        articles = articles if articles is not None else self.article_store.get_articles(news_ids=news_ids)
+        keys = {self.partition_key(articles.get(news_id, {}).get("pub_date")) for news_id in news_ids}
+        with self.partition_lock:
+            return [self.partitions[key] for key in sorted(keys) if key in self.partitions]
+    
+    
+    # run a per-collection call on every collection in parallel.
+    def _fan_out(self, func, collections: list) -> list:
+        if len(collections) <= 1:
+            return [func(collection) for collection in collections]
+        with ThreadPoolExecutor(max_workers=min(self.query_workers, len(collections))) as executor:
+            return list(executor.map(func, collections))
+    
+    
+    def count(self) -> int:
+        return sum(collection.count() for collection in self._collections())
+    
+    
+    def get_chunks(self, ids: list[str], include: list[str]) -> dict:
+        merged = {"ids": [], "documents": [], "metadatas": []}
+        collections = self._collections_for_news_ids(news_ids=self._chunks_to_news_ids(ids))
+        for result in self._fan_out(lambda collection: collection.get(ids=ids, include=include), collections):
+            merged["ids"].extend(result["ids"])
+            for field in ("documents", "metadatas"):
+                if field in include:
+                    merged[field].extend(result[field])
+        
+        return merged
+    
+    
+    def list_partitions(self) -> list[dict]:
+        with self.partition_lock:
+            partitions = dict(self.partitions)
+        
+        return [{"partition": key, "chunks": collection.count()} for key, collection in sorted(partitions.items())]
+    
+    
+    def _copy_collection(self, source, target, batch_size: int = 500) -> int:
+        offset = 0
+        while True:
+            batch = source.get(include=["embeddings", "documents", "metadatas"], limit=batch_size, offset=offset)
+            if not batch["ids"]:
+                break
+            target.upsert(ids=batch["ids"], embeddings=batch["embeddings"], documents=batch["documents"], metadatas=batch["metadatas"])
+            offset += len(batch["ids"])
+        
+        return offset
+    
+    
+    # keys of dated partitions that end before a YYYYMM / YYYY key.
+    def _partitions_before(self, before: str) -> list[str]:
+        if self.partition_format is None:
+            raise ValueError("chroma_partition_by=none: there are no partitions to archive or drop.")
+        with self.partition_lock:
+            keys = list(self.partitions)
+        cutoff = datetime.strptime(before, self.partition_format).timestamp()
+        
+        return sorted(key for key in keys if key != UNDATED_PARTITION and self._partition_range(key)[1] < cutoff)
+    
+    
+    def _remove_partition(self, key: str) -> int:
+        with self.partition_lock:
+            collection = self.partitions.pop(key)
+        removed = 0
+        while True:
+            batch = collection.get(include=[], limit=500, offset=removed)
+            if not batch["ids"]:
+                break
+            self.lexical_index.delete(ids=batch["ids"])
+            removed += len(batch["ids"])
+        self.client.delete_collection(name=collection.name)
+        
+        return removed
+    
+    
+    # move old partitions (with their embeddings) to the archive store; article summaries stay queryable.
+    def archive_partitions(self, before: str) -> list[str]:
+        if self.archive_client is None:
+            self.archive_client = chromadb.PersistentClient(path=self.archive_path)
+        archived = []
+        for key in self._partitions_before(before):
+            target = self._open_collection(client=self.archive_client, name=f"{self.collection_name}_{key}", create=True)
+            copied = self._copy_collection(source=self.partitions[key], target=target)
+            self._remove_partition(key)
+            archived.append(key)
+            self.logger.info(f"{ChromaDBHandler.__name__}: archived partition {key} ({copied} chunks) to {self.archive_path}.")
+        
+        return archived
+    
+    
+    def restore_partition(self, key: str) -> int:
+        if self.archive_client is None:
+            self.archive_client = chromadb.PersistentClient(path=self.archive_path)
+        source = self._open_collection(client=self.archive_client, name=f"{self.collection_name}_{key}")
+        target = self._partition(key)
+        copied = self._copy_collection(source=source, target=target)
+        self.archive_client.delete_collection(name=source.name)
+        self.reindex_lexical(collections=[target])
+        self.logger.info(f"{ChromaDBHandler.__name__}: restored partition {key} ({copied} chunks) from {self.archive_path}.")
+        
+        return copied
+    
+    
+    # delete old partitions outright; article summaries stay in the article store.
+    def drop_partitions(self, before: str) -> list[str]:
+        dropped = []
+        for key in self._partitions_before(before):
+            removed = self._remove_partition(key)
+            dropped.append(key)
+            self.logger.info(f"{ChromaDBHandler.__name__}: dropped partition {key} ({removed} chunks).")
+        
+        return dropped
     
     
-    # save splits to chromaDB.   
-    def add_documents_to_chromadb(self, ids: list[str], documents: list[str], metadatas: list[dict]) -> None:
-        self.collection.upsert(
-            ids=ids,
-            documents=documents,
-            metadatas=metadatas
+    # copy a pre-partitioning collection into partitions by pub_date, keeping embeddings, then delete it.
+    def migrate_to_partitions(self, batch_size: int = 500) -> None:
+        legacy = self._open_collection(client=self.client, name=self.collection_name)
+        offset = 0
+        while True:
+            batch = legacy.get(include=["embeddings", "documents", "metadatas"], limit=batch_size, offset=offset)
+            if not batch["ids"]:
+                break
+            groups: dict[str, list[int]] = {}
+            for index, metadata in enumerate(batch["metadatas"]):
+                groups.setdefault(self.partition_key(metadata.get("pub_date")), []).append(index)
+            for key, indexes in groups.items():
+                self._partition(key).upsert(
+                    ids=[batch["ids"][i] for i in indexes],
+                    embeddings=[batch["embeddings"][i] for i in indexes],
+                    documents=[batch["documents"][i] for i in indexes],
+                    metadatas=[batch["metadatas"][i] for i in indexes]
+                )
+            offset += len(batch["ids"])
+        self.client.delete_collection(name=self.collection_name)
+        self.logger.info(f"{ChromaDBHandler.__name__}: migrated {offset} chunks from {self.collection_name} into {len(self.partitions)} partitions.")
+        
+        return
+    
+    
+    # chunks left over from an earlier, longer split of the same press releases.
+    def _stale_chunk_ids(self, collection, ids: list[str], metadatas: list[dict]) -> list[str]:
+        news_ids = list({metadata["news_id"] for metadata in metadatas})
+        existing = collection.get(where={"news_id": {"$in": news_ids}}, include=[])["ids"]
+        new_ids = set(ids)
+        
+        return [chunk_id for chunk_id in existing if chunk_id not in new_ids]
+    
+    
+    # save articles to the article store and splits to chromaDB, routed to partitions by pub_date.   
+    def add_documents_to_chromadb(self, ids: list[str], documents: list[str], metadatas: list[dict], articles: list[dict]) -> None:
+        groups: dict[str, list[int]] = {}
+        for index, metadata in enumerate(metadatas):
+            key = self.partition_key(metadata.get("pub_date")) if self.partition_format else self.collection_name
+            groups.setdefault(key, []).append(index)
+        routed = [
+            (self._partition(key) if self.partition_format else self.collection, [ids[i] for i in indexes], [documents[i] for i in indexes], [metadatas[i] for i in indexes])
+            for key, indexes in groups.items()
+        ]
+        
+        for collection, group_ids, _, group_metadatas in routed:
+            stale_ids = self._stale_chunk_ids(collection=collection, ids=group_ids, metadatas=group_metadatas)
+            if stale_ids:
+                collection.delete(ids=stale_ids)
+                self.lexical_index.delete(ids=stale_ids)
+                self.logger.info("%s: removed %d stale chunks of re-split press releases.", ChromaDBHandler.__name__, len(stale_ids))
+        with metrics.span("article_store_upsert"):
+            self.article_store.upsert_articles(articles=articles)
+        with metrics.span("rollup_update"):
+            self.rollup_store.apply(articles=articles)
+        with metrics.span("chroma_upsert"):
+            for collection, group_ids, group_documents, group_metadatas in routed:
+                collection.upsert(
+                    ids=group_ids,
+                    documents=group_documents,
+                    metadatas=group_metadatas
+                )
+        with metrics.span("lexical_index_update"):
+            self.lexical_index.add(
+                ids=ids,
+                documents=documents,
+                metadatas=metadatas,
+                articles={article["news_id"]: article for article in articles}
+            )
+        news_ids = {metadata["news_id"] for metadata in metadatas}
+        self.logger.info("%s: added %d new chunks for %d press releases.", ChromaDBHandler.__name__, len(documents), len(news_ids))
+
+        return
+    
+    
+    # buffer splits and write them to chromaDB in bulk; returns the news ids written by any triggered flush.
+    def buffer_documents_for_chromadb(self, ids: list[str], documents: list[str], metadatas: list[dict], article: dict) -> list[str]:
+        with self.buffer_lock:
+            self.buffer_ids.extend(ids)
+            self.buffer_documents.extend(documents)
+            self.buffer_metadatas.extend(metadatas)
+            self.buffer_articles.append(article)
+            due = len(self.buffer_ids) >= self.flush_size
+        
+        return self.flush() if due or self.flush_due() else []
+    
+    
+    # buffered splits older than the flush interval; polled by the crawl pipeline so quiet periods still flush.
+    def flush_due(self) -> bool:
+        with self.buffer_lock:
+            return bool(self.buffer_ids) and timer.monotonic() - self.last_flush >= self.flush_interval
+    
+    
+    def flush(self) -> list[str]:
+        with self.flush_lock:
+            with self.buffer_lock:
+                ids, documents, metadatas, articles = self.buffer_ids, self.buffer_documents, self.buffer_metadatas, self.buffer_articles
+                self.buffer_ids, self.buffer_documents, self.buffer_metadatas, self.buffer_articles = [], [], [], []
+                self.last_flush = timer.monotonic()
+            if not ids:
+                return []
+            
+            start = timer.perf_counter()
+            self.add_documents_to_chromadb(ids=ids, documents=documents, metadatas=metadatas, articles=articles)
+            elapsed = timer.perf_counter() - start
+        
+        news_ids = list(dict.fromkeys(metadata["news_id"] for metadata in metadatas))
+        self.logger.info(
+            "%s: flushed %d chunks / %d press releases in %.2fs (%.1f chunks/s).",
+            ChromaDBHandler.__name__, len(ids), len(news_ids), elapsed, len(ids) / max(elapsed, 1e-6),
+            extra={"chunks": len(ids), "articles": len(news_ids), "elapsed_s": round(elapsed, 3)}
         )
-        self.logger.info(f"{ChromaDBHandler.__name__}: added {len(documents)} new chunks for id={metadatas[0]["news_id"]}")
+        
+        return news_ids
+    
 
+    # rebuild the lexical index from every chunk already stored in chromaDB.
+    def reindex_lexical(self, batch_size: int = 500, collections: list | None = None) -> None:
+        total = 0
+        for collection in collections or self._collections():
+            offset = 0
+            while True:
+                batch = collection.get(include=["documents", "metadatas"], limit=batch_size, offset=offset)
+                if not batch["ids"]:
+                    break
+                articles = self.article_store.get_articles(news_ids=self._chunks_to_news_ids(batch["ids"]))
+                self.lexical_index.add(ids=batch["ids"], documents=batch["documents"], metadatas=batch["metadatas"], articles=articles)
+                offset += len(batch["ids"])
+            total += offset
+        self.logger.info(f"{ChromaDBHandler.__name__}: reindexed {total} chunks into the lexical index.")
+        
         return
     
+    
+    # copy per-article fields into the article store and strip them from chunk metadata.
+    def migrate_article_metadata(self, batch_size: int = 500) -> None:
+        article_fields = ["url", "title", "pub_time", "summary", "keywords", "organizations"]
+        total, migrated = 0, 0
+        for collection in self._collections():
+            offset = 0
+            while True:
+                batch = collection.get(include=["metadatas"], limit=batch_size, offset=offset)
+                if not batch["ids"]:
+                    break
+                articles = {}
+                for metadata in batch["metadatas"]:
+                    if metadata.get("chunk", 0) == 0 or metadata["news_id"] not in articles:
+                        articles[metadata["news_id"]] = {
+                            "news_id": metadata["news_id"],
+                            "pub_date": metadata.get("pub_date"),
+                            **{field: metadata.get(field) for field in article_fields}
+                        }
+                self.article_store.upsert_articles(articles=list(articles.values()))
+                # the rollups were built from the article store, which had none of these articles yet.
+                self.rollup_store.apply(articles=list(articles.values()))
+                # a None value removes the key from the chunk metadata.
+                collection.update(
+                    ids=batch["ids"],
+                    metadatas=[{field: None for field in article_fields} for _ in batch["ids"]]
+                )
+                migrated += len(articles)
+                offset += len(batch["ids"])
+            total += offset
+        self.logger.info(f"{ChromaDBHandler.__name__}: migrated {migrated} articles from {total} chunks into the article store.")
+        
+        return
+    
+    
+    def _date_where(self, start_unix: int | None, end_unix: int | None) -> dict | None:
+        conditions = []
+        if start_unix is not None:
+            conditions.append({"pub_date": {"$gte": start_unix} })
+        if end_unix is not None:
+            conditions.append({"pub_date": {"$lte": end_unix} })
+        if not conditions:
+            return None
+        
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+    
+    
+    # nearest chunks from every partition overlapping the range, merged by distance.
+    def _query_nearest(self, collections: list, query: str, n_results: int, where: dict | None) -> list[str]:
+        if not collections:
+            return []
+        query_embeddings = self.embedding_function([query])
+        
+        def query_partition(collection) -> list[tuple[float, str]]:
+            results = collection.query(query_embeddings=query_embeddings, n_results=n_results, include=["distances"], where=where)
+            return list(zip(results["distances"][0], results["ids"][0]))
+        
+        with metrics.span("chroma_query"):
+            hits = [hit for hits in self._fan_out(query_partition, collections) for hit in hits]
+        
+        return [chunk_id for _, chunk_id in heapq.nsmallest(n_results, hits)]
+    
+    
+    def query_chunk_ids(self, query: str, n_results: int, start_unix: int | None = None, end_unix: int | None = None) -> list[str]:
+        return self._query_nearest(
+            collections=self._collections(start_unix=start_unix, end_unix=end_unix),
+            query=query,
+            n_results=n_results,
+            where=self._date_where(start_unix=start_unix, end_unix=end_unix)
+        )
+    
 
     # query retriever.
-    def check_records_by_dates(self, start_date: str, end_date: str):
-        return self.collection.get(
-            include=["documents"],
-            where={
-                "$and": [
-                    {"pub_date": {"$gte": date_to_unix(start_date)} },
-                    {"pub_date": {"$lte": date_to_unix(end_date)} }
-                ]
-            }
-        )
+    def _chunks_to_news_ids(self, chunk_ids: list[str]) -> list[str]:
+        return list(dict.fromkeys(chunk_id.split("#", 1)[0] for chunk_id in chunk_ids))
+    
+    
+    # page arguments come from the agent, so keep them within 0 <= offset and 1 <= limit <= query_max_limit.
+    def _clamp_page(self, limit: int, offset: int) -> tuple[int, int]:
+        return max(1, min(int(limit), self.query_max_limit)), max(0, int(offset))
+    
+    
+    # join a page of news ids with the article store into one projected record per press release.
+    def _page_records(self, news_ids: list[str], total: int, limit: int, offset: int, fields: list[str] | None) -> dict:
+        limit, offset = self._clamp_page(limit=limit, offset=offset)
+        fields = [field for field in (fields or self.default_fields) if field in self.allowed_fields]
+        page_ids = news_ids[offset:offset + limit]
+        
+        articles = self.article_store.get_articles(news_ids=page_ids)
+        records = {
+            news_id: {"news_id": news_id, **{field: articles.get(news_id, {}).get(field) for field in fields if field != "document"}}
+            for news_id in page_ids
+        }
+        if page_ids and "document" in fields:
+            chunks = {"metadatas": [], "documents": []}
+            for result in self._fan_out(
+                lambda collection: collection.get(where={"news_id": {"$in": page_ids} }, include=["metadatas", "documents"]),
+                self._collections_for_news_ids(news_ids=page_ids, articles=articles)
+            ):
+                chunks["metadatas"].extend(result["metadatas"])
+                chunks["documents"].extend(result["documents"])
+            ordered = sorted(zip(chunks["metadatas"], chunks["documents"]), key=lambda item: item[0].get("chunk", 0))
+            for metadata, document in ordered:
+                record = records[metadata["news_id"]]
+                # chunks are split on whitespace, so keep a separator between them.
+                record["document"] = f"{record['document']}\n{document}" if "document" in record else document
+        
+        next_offset = offset + limit if offset + limit < total else None
+        
+        return {
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "next_offset": next_offset,
+            "records": [records[news_id] for news_id in page_ids]
+        }
     
     
-    def check_records_by_keyword(self, keyword: str):
-        return self.collection.query(
-            query_texts=[keyword],
-            include=["documents"],
-            where={ "summary": {"$contains": keyword} }
+    def _ranked_news_ids(self, keyword: str, matched: list[str], limit: int, offset: int) -> list[str]:
+        if not matched:
+            return []
+        
+        # rank only as many chunks as the requested page needs, then append the unranked remainder.
+        n_results = min(len(matched) * self.chunks_per_article, (offset + limit) * self.chunks_per_article)
+        ranked = self._query_nearest(
+            collections=self._collections_for_news_ids(news_ids=matched),
+            query=keyword,
+            n_results=n_results,
+            where={"news_id": {"$in": matched} }
         )
+        ranked_ids = self._chunks_to_news_ids(ranked)
+        ranked_set = set(ranked_ids)
+        
+        return ranked_ids + [news_id for news_id in matched if news_id not in ranked_set]
+    
+    
+    def check_records_by_dates(self, start_date: str, end_date: str, limit: int = 20, offset: int = 0, fields: list[str] | None = None) -> dict:
+        news_ids = self.article_store.search_news_ids(start_unix=date_to_unix(start_date), end_unix=date_to_unix(end_date))
+        
+        return self._page_records(news_ids=news_ids, total=len(news_ids), limit=limit, offset=offset, fields=fields)
+    
+    
+    def check_records_by_keyword(self, keyword: str, limit: int = 20, offset: int = 0, fields: list[str] | None = None) -> dict:
+        matched = self.article_store.search_news_ids(keyword=keyword)
+        limit, offset = self._clamp_page(limit=limit, offset=offset)
+        news_ids = self._ranked_news_ids(keyword=keyword, matched=matched, limit=limit, offset=offset)
+        
+        return self._page_records(news_ids=news_ids, total=len(matched), limit=limit, offset=offset, fields=fields)
     
       
-    def check_records_by_keyword_and_dates(self, keyword: str, start_date: str, end_date: str):
-        return self.collection.query(
-            query_texts=[keyword],
-            include=["documents"],
-            where={
-                "$and": [
-                    {"pub_date": {"$gte": date_to_unix(start_date)} },
-                    {"pub_date": {"$lte": date_to_unix(end_date)} },
-                    {"summary": {"$contains": keyword} }
-                ]
-            }
+    def check_records_by_keyword_and_dates(self, keyword: str, start_date: str, end_date: str, limit: int = 20, offset: int = 0, fields: list[str] | None = None) -> dict:
+        matched = self.article_store.search_news_ids(
+            keyword=keyword,
+            start_unix=date_to_unix(start_date),
+            end_unix=date_to_unix(end_date)
         )
+        limit, offset = self._clamp_page(limit=limit, offset=offset)
+        news_ids = self._ranked_news_ids(keyword=keyword, matched=matched, limit=limit, offset=offset)
+        
+        return self._page_records(news_ids=news_ids, total=len(matched), limit=limit, offset=offset, fields=fields)
@@ -0,0 +1,67 @@
+from typing import Any, Callable
+import threading
+
+from tools.Metrics import metrics
+
+
+# stands in for a registered component and builds it on first attribute access.
+class LazyComponent:
+    def __init__(self, registry: "ComponentRegistry", name: str):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._registry.get(self._name), attr)
+
+
+    def __repr__(self) -> str:
+        state = "built" if self._registry.is_built(self._name) else "lazy"
+        return f"<LazyComponent {self._name} ({state})>"
+
+
+class ComponentRegistry:
+    def __init__(self, logger):
+        self.logger = logger
+        self.factories: dict[str, Callable[[], Any]] = {}
+        self.components: dict[str, Any] = {}
+        # re-entrant: a factory resolves the components it depends on.
+        self.lock = threading.RLock()
+
+        self.logger.info(f"{ComponentRegistry.__name__} initiated.")
+
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        with self.lock:
+            self.factories[name] = factory
+            self.components.pop(name, None)
+
+        return
+
+
+    def is_built(self, name: str) -> bool:
+        return name in self.components
+
+
+    # build the component (and its dependencies) once, on first use.
+    def get(self, name: str) -> Any:
+        component = self.components.get(name)
+        if component is not None:
+            return component
+        with self.lock:
+            if name not in self.components:
+                if name not in self.factories:
+                    raise KeyError(f"{ComponentRegistry.__name__}: no component registered as '{name}'.")
+                with metrics.span(f"init_{name}"):
+                    self.components[name] = self.factories[name]()
+                self.logger.debug(f"{ComponentRegistry.__name__}: built '{name}'.")
+            return self.components[name]
+
+
+    # a handle that can be injected now and only builds the component when it is used.
+    def proxy(self, name: str) -> LazyComponent:
+        return LazyComponent(registry=self, name=name)
+
+
+    def built(self) -> list[str]:
+        return list(self.components)
@@ -0,0 +1,317 @@
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+
+from tools.DataProcessor import news_id_from_url
+
+import os
+
+
+# extraction status of a press release in the ledger.
+STATUS_FETCHED = "fetched"
+STATUS_EXTRACTED = "extracted"
+STATUS_INGESTED = "ingested"
+STATUS_FAILED = "failed"
+STATUS_NOT_FOUND = "not_found"
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CrawlLedger:
+    def __init__(self, logger):
+        self.logger = logger
+
+        # ledger config.
+        self.ledger_path = os.getenv("crawl_ledger_path", "./crawl_ledger.db")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.ledger_path, check_same_thread=False)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_ledger (
+                news_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                content_hash TEXT,
+                ingested_at TEXT,
+                status TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS dead_letters (
+                url TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                error TEXT,
+                attempts INTEGER NOT NULL,
+                last_attempt TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS date_pages (
+                page_date TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                link_count INTEGER NOT NULL,
+                complete INTEGER NOT NULL,
+                last_polled TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS date_page_links (
+                page_date TEXT NOT NULL,
+                news_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                PRIMARY KEY (page_date, news_id)
+            );
+            """
+        )
+        # ledgers written before revalidation have no checked_at column.
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(crawl_ledger)")}
+        if "checked_at" not in columns:
+            self.conn.execute("ALTER TABLE crawl_ledger ADD COLUMN checked_at TEXT")
+        self.conn.commit()
+        self.dead_letter_urls = {row[0] for row in self.conn.execute("SELECT url FROM dead_letters")}
+        self.logger.info(f"{CrawlLedger.__name__} initiated.")
+
+
+    # ledger lookups.
+    def get_record(self, news_id: str) -> dict | None:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT news_id, url, content_hash, ingested_at, status FROM crawl_ledger WHERE news_id = ?",
+                (news_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        return dict(zip(["news_id", "url", "content_hash", "ingested_at", "status"], row))
+
+
+    def is_ingested(self, news_id: str) -> bool:
+        record = self.get_record(news_id=news_id)
+        return record is not None and record["status"] == STATUS_INGESTED
+
+
+    def is_unchanged(self, news_id: str, text: str) -> bool:
+        record = self.get_record(news_id=news_id)
+        return (
+            record is not None
+            and record["status"] == STATUS_INGESTED
+            and record["content_hash"] == content_hash(text)
+        )
+
+
+    # news ids not in one of the done statuses; by default only ingested ones are done.
+    def filter_pending(self, news_ids: list[str], done_statuses: tuple[str, ...] = (STATUS_INGESTED,)) -> list[str]:
+        if not news_ids:
+            return []
+        done = set()
+        status_placeholders = ",".join("?" * len(done_statuses))
+        with self.lock:
+            for i in range(0, len(news_ids), 500):
+                batch = news_ids[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.conn.execute(
+                    f"SELECT news_id FROM crawl_ledger WHERE status IN ({status_placeholders}) AND news_id IN ({placeholders})",
+                    (*done_statuses, *batch)
+                ).fetchall()
+                done.update(row[0] for row in rows)
+
+        return [news_id for news_id in news_ids if news_id not in done]
+
+
+    # ingested press releases not checked for changes within the last interval seconds.
+    def due_for_revalidation(self, news_ids: list[str], interval: float) -> list[str]:
+        if not news_ids:
+            return []
+        cutoff = datetime.fromtimestamp(datetime.now().timestamp() - interval).isoformat(timespec="seconds")
+        due = set()
+        with self.lock:
+            for i in range(0, len(news_ids), 500):
+                batch = news_ids[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.conn.execute(
+                    f"SELECT news_id FROM crawl_ledger WHERE status = ? AND COALESCE(checked_at, ingested_at) < ? AND news_id IN ({placeholders})",
+                    (STATUS_INGESTED, cutoff, *batch)
+                ).fetchall()
+                due.update(row[0] for row in rows)
+
+        return [news_id for news_id in news_ids if news_id in due]
+
+
+    # ledger updates.
+    def mark(self, news_id: str, url: str, status: str, text: str | None = None) -> None:
+        with self.lock:
+            self.conn.execute(
+                """
+                INSERT INTO crawl_ledger (news_id, url, content_hash, ingested_at, status)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(news_id) DO UPDATE SET
+                    url = excluded.url,
+                    content_hash = COALESCE(excluded.content_hash, crawl_ledger.content_hash),
+                    ingested_at = COALESCE(excluded.ingested_at, crawl_ledger.ingested_at),
+                    status = excluded.status
+                """,
+                (
+                    news_id,
+                    url,
+                    content_hash(text) if text is not None else None,
+                    datetime.now().isoformat(timespec="seconds") if status == STATUS_INGESTED else None,
+                    status
+                )
+            )
+            self.conn.commit()
+        self.logger.debug("%s: news_id=%s marked as %s.", CrawlLedger.__name__, news_id, status, extra={"news_id": news_id, "status": status})
+
+        return
+
+
+    def mark_checked(self, news_id: str) -> None:
+        with self.lock:
+            self.conn.execute("UPDATE crawl_ledger SET checked_at = ? WHERE news_id = ?", (datetime.now().isoformat(timespec="seconds"), news_id))
+            self.conn.commit()
+
+        return
+
+
+    def mark_ingested(self, news_ids: list[str]) -> None:
+        if not news_ids:
+            return
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.lock:
+            self.conn.executemany(
+                "UPDATE crawl_ledger SET status = ?, ingested_at = ?, checked_at = ? WHERE news_id = ?",
+                [(STATUS_INGESTED, now, now, news_id) for news_id in news_ids]
+            )
+            self.conn.commit()
+        self.logger.info("%s: %d press releases marked as %s.", CrawlLedger.__name__, len(news_ids), STATUS_INGESTED)
+
+        return
+
+
+    # dead-letter list of urls that still failed after all retries.
+    def add_dead_letter(self, url: str, kind: str, error: str, attempts: int) -> None:
+        with self.lock:
+            self.conn.execute(
+                """
+                INSERT INTO dead_letters (url, kind, error, attempts, last_attempt) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    error = excluded.error,
+                    attempts = dead_letters.attempts + excluded.attempts,
+                    last_attempt = excluded.last_attempt
+                """,
+                (url, kind, error, attempts, datetime.now().isoformat(timespec="seconds"))
+            )
+            self.conn.commit()
+            self.dead_letter_urls.add(url)
+        self.logger.warning("%s: %s page %s dead-lettered after %d attempts: %s", CrawlLedger.__name__, kind, url, attempts, error)
+
+        return
+
+
+    def remove_dead_letter(self, url: str) -> None:
+        if url not in self.dead_letter_urls:
+            return
+        with self.lock:
+            self.conn.execute("DELETE FROM dead_letters WHERE url = ?", (url,))
+            self.conn.commit()
+            self.dead_letter_urls.discard(url)
+
+        return
+
+
+    def list_dead_letters(self, kind: str | None = None) -> list[str]:
+        with self.lock:
+            if kind is None:
+                rows = self.conn.execute("SELECT url FROM dead_letters ORDER BY last_attempt").fetchall()
+            else:
+                rows = self.conn.execute("SELECT url FROM dead_letters WHERE kind = ? ORDER BY last_attempt", (kind,)).fetchall()
+
+        return [row[0] for row in rows]
+
+
+    # press release links seen on each daily index page.
+    def record_date_page(self, page_date: str, url: str, news_links: list[str], complete: bool) -> list[str]:
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.lock:
+            known = {row[0] for row in self.conn.execute("SELECT url FROM date_page_links WHERE page_date = ?", (page_date,))}
+            new_links = [link for link in news_links if link not in known]
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO date_page_links (page_date, news_id, url, first_seen) VALUES (?, ?, ?, ?)",
+                [(page_date, news_id_from_url(link), link, now) for link in new_links]
+            )
+            self.conn.execute(
+                """
+                INSERT INTO date_pages (page_date, url, link_count, complete, last_polled) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(page_date) DO UPDATE SET
+                    url = excluded.url,
+                    link_count = excluded.link_count,
+                    complete = excluded.complete,
+                    last_polled = excluded.last_polled
+                """,
+                (page_date, url, len(known) + len(new_links), int(complete), now)
+            )
+            self.conn.commit()
+        self.logger.debug("%s: date page %s has %d links, %d new.", CrawlLedger.__name__, page_date, len(known) + len(new_links), len(new_links))
+
+        return new_links
+
+
+    # days whose index page was last polled after they could still change.
+    def complete_days(self, page_dates: list[str]) -> set[str]:
+        if not page_dates:
+            return set()
+        with self.lock:
+            placeholders = ",".join("?" * len(page_dates))
+            rows = self.conn.execute(
+                f"SELECT page_date FROM date_pages WHERE complete = 1 AND page_date IN ({placeholders})",
+                page_dates
+            ).fetchall()
+
+        return {row[0] for row in rows}
+
+
+    def polled_days(self, page_dates: list[str]) -> set[str]:
+        if not page_dates:
+            return set()
+        with self.lock:
+            placeholders = ",".join("?" * len(page_dates))
+            rows = self.conn.execute(
+                f"SELECT page_date FROM date_pages WHERE page_date IN ({placeholders})",
+                page_dates
+            ).fetchall()
+
+        return {row[0] for row in rows}
+
+
+    # days not fully ingested: index page never polled or dead-lettered, or a listed press release neither ingested nor gone.
+    def unfinished_days(self, page_dates: list[str]) -> list[str]:
+        if not page_dates:
+            return []
+        with self.lock:
+            placeholders = ",".join("?" * len(page_dates))
+            polled = dict(self.conn.execute(
+                f"SELECT page_date, url FROM date_pages WHERE page_date IN ({placeholders})",
+                page_dates
+            ).fetchall())
+            pending = {row[0] for row in self.conn.execute(
+                f"""
+                SELECT DISTINCT links.page_date FROM date_page_links AS links
+                LEFT JOIN crawl_ledger AS ledger ON ledger.news_id = links.news_id AND ledger.status IN (?, ?)
+                WHERE ledger.news_id IS NULL AND links.page_date IN ({placeholders})
+                """,
+                (STATUS_INGESTED, STATUS_NOT_FOUND, *page_dates)
+            ).fetchall()}
+
+        return [
+            page_date for page_date in page_dates
+            if page_date not in polled or polled[page_date] in self.dead_letter_urls or page_date in pending
+        ]
+
+
+    def known_links(self, page_dates: list[str]) -> list[str]:
+        if not page_dates:
+            return []
+        with self.lock:
+            placeholders = ",".join("?" * len(page_dates))
+            rows = self.conn.execute(
+                f"SELECT url FROM date_page_links WHERE page_date IN ({placeholders}) ORDER BY page_date, news_id",
+                page_dates
+            ).fetchall()
+
+        return [row[0] for row in rows]
@@ -1,11 +1,20 @@
 from datetime import datetime, timedelta, date, time
-from crawl4ai import CrawlResult
-from typing import List
+from typing import List, TYPE_CHECKING
 import re
 
+if TYPE_CHECKING:
+    from crawl4ai import CrawlResult
+
 
 from tools.logger import Logger
 
+
+# press release links, e.g. /gia/general/202608/01/P2026080100123.htm.
+NEWS_URL_PATTERN = re.compile(r"/P\w+\.htm")
+# date and press release urls carry their day, e.g. /gia/general/202608/01.htm.
+PAGE_DATE_PATTERN = re.compile(r"/(?P<month>\d{6})/(?P<day>\d{2})[/.]")
+
+
 # data processing functions.
 def generate_date_range(startDate: str, endDate: str, logger: Logger) -> list[str]:
     start_date = datetime.strptime(startDate, "%Y%m%d")
@@ -17,7 +26,8 @@ def generate_date_range(startDate: str, endDate: str, logger: Logger) -> list[st
         dates.append(current.strftime("%Y%m%d"))
         current += timedelta(days=1)
     
-    logger.info(f"Generated date range from {startDate} to {endDate}: {dates}")
+    logger.info("Generated date range from %s to %s: %d dates", startDate, endDate, len(dates))
+    logger.debug("Dates: %s", dates)
     
     return dates
 
@@ -25,23 +35,34 @@ def generate_date_range(startDate: str, endDate: str, logger: Logger) -> list[st
 def generate_date_urls(startDate: str, endDate: str, logger: Logger) -> list[str]:
     dates = generate_date_range(startDate=startDate, endDate=endDate, logger=logger)
     urls = [f"https://www.info.gov.hk/gia/general/{date[:-2]}/{date[-2:]}.htm" for date in dates]
-    logger.info(f"Generated {len(urls)} date URLs: {urls}")
+    logger.info("Generated %d date URLs.", len(urls))
+    logger.debug("Date URLs: %s", urls)
     
     return urls
 
 
-def consolidate_news_urls(results: List[CrawlResult], logger: Logger) -> list[str]:
-    news_links = []
+# unique press release links in page order; date pages repeat links under several headings.
+def consolidate_news_urls(results: List["CrawlResult"], logger: Logger) -> list[str]:
+    news_links = {}
     for result in results:
-        links = result.links.get("internal", [])
-        for link in links:
-            if re.search(pattern=r"P.*\.htm", string=link["href"]):
-                    news_links.append(link["href"])
+        for link in result.links.get("internal", []):
+            href = link["href"]
+            if href not in news_links and NEWS_URL_PATTERN.search(href):
+                news_links[href] = None
     
-    logger.info(f"Extracted {len(news_links)} news URLs from crawl results.")
-    logger.info(f"Consolidated news URLs: {news_links}")
+    logger.info("Extracted %d news URLs from crawl results.", len(news_links))
+    logger.debug("Consolidated news URLs: %s", list(news_links))
     
-    return news_links
+    return list(news_links)
+
+
+def news_id_from_url(url: str) -> str:
+    return url.split("/")[-1].split(".")[0]
+
+
+def page_date_from_url(url: str) -> str | None:
+    match = PAGE_DATE_PATTERN.search(url)
+    return f"{match.group('month')}{match.group('day')}" if match else None
 
 
 def date_to_unix(date_str: str) -> int: 
@@ -1,13 +1,13 @@
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-from tools.DataProcessor import date_to_unix, transform_text_to_date, transform_text_to_time
+from tools.PressReleaseParser import PressRelease
+from tools.Metrics import metrics
 
 from pprint import pformat
+import logging
 from datetime import datetime, date, time
 
 import os
-from dotenv import load_dotenv
-load_dotenv()
 
 
 class DocumentGenerator:
@@ -26,25 +26,41 @@ class DocumentGenerator:
     
     # split text.
     def _split_text_from_news(self, content: str):
-        all_splits = self.text_splitter.split_text(text=content)
-        self.logger.info(f"{DocumentGenerator.__name__}: Split content into {len(all_splits)} sub-texts.")
+        with metrics.span("split"):
+            all_splits = self.text_splitter.split_text(text=content)
+        metrics.inc("chunks_generated", len(all_splits))
+        self.logger.info("%s: Split content into %d sub-texts.", DocumentGenerator.__name__, len(all_splits))
         
-        for i, split in enumerate(all_splits):
-            self.logger.info(f"Split No. {i}: \n{split}")
-        self.logger.info("-"*50)
+        # full split dumps only when debug logging is on.
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for i, split in enumerate(all_splits):
+                self.logger.debug("Split No. %d: \n%s", i, split)
+            self.logger.debug("-"*50)
         
         return all_splits
     
     
-    def generate_documents(self, data, result): 
-        url = result.url
-        news_id = url.split("/")[-1].split(".")[0]
-        title = result.metadata["title"]
-        date_str=result.markdown.split("\n")[-4].split(", ", 1)[-1].strip()
-        time_str=result.markdown.split("\n")[-3].split(" ")[-2]
+    def generate_documents(self, data, release: PressRelease): 
+        news_id = release.news_id
+        title = release.title
         
         # get all splitted text from news content.
-        all_splits = self._split_text_from_news(content=result.markdown)
+        all_splits = self._split_text_from_news(content=release.body)
+       
+        # per-article fields are stored once in the article store.
+        pub_date = release.pub_date_unix
+        article = {
+            "news_id": news_id,
+            "url": release.url,
+            "title": title,
+            "pub_date": pub_date,
+            "pub_time": release.pub_time.strftime("%H:%M:%S"),
+            "summary": data.get("summary"),
+            "keywords": data.get("keywords"),
+            "organizations": data.get("organizations")
+        }
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("article: \n%s", pformat(article))
        
         # generate document ids and metadatas for each splitted text.
         ids = []
@@ -54,26 +70,20 @@ class DocumentGenerator:
             id=f"{news_id}#chunk={i}"
             metadata={
                 "news_id": news_id,
-                "pub_date": date_to_unix(date_str=date_str),
-                "pub_time": transform_text_to_time(time_str=time_str, logger=self.logger),
-                "title": result.metadata["title"],
-                "summary": data.get("summary"),
-                "keywords": data.get("keywords"),
-                "organizations": data.get("organizations"),
-                "url": url,
+                "pub_date": pub_date,
                 "chunk": i
             }
             ids.append(id)
             metadatas.append(metadata)
             
-            self.logger.info(f"id: {id}")
-            self.logger.info(f"metadata: \n%s", pformat(metadata))
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("id: %s", id)
+                self.logger.debug("metadata: \n%s", pformat(metadata))
             
-            self.logger.info(f"Total {len(all_splits)} splited documents for Press Release - Title: {result.metadata["title"]}, news_id: {news_id} created.")
-            self.logger.info("-"*50)
+        self.logger.info(
+            "Total %d splited documents for Press Release - Title: %s, news_id: %s created.",
+            len(all_splits), title, news_id,
+            extra={"news_id": news_id, "chunks": len(all_splits)}
+        )
         
-        return ids, metadatas, all_splits
-    
-    
-
- 
\ No newline at end of file
+        return ids, metadatas, all_splits, article
@@ -0,0 +1,148 @@
+from chromadb.api.types import Documents, Embeddings
+from chromadb.utils.embedding_functions.ollama_embedding_function import OllamaEmbeddingFunction
+
+import numpy as np
+import sqlite3
+import hashlib
+import threading
+import time
+
+from tools.Metrics import metrics
+
+import os
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    def __init__(self, logger):
+        self.logger = logger
+
+        # cache config.
+        self.cache_path = os.getenv("embedding_cache_path", "./embedding_cache.db")
+        self.max_entries = int(os.getenv("embedding_cache_max_entries", "200000"))
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used ON embedding_cache (last_used)")
+        self.conn.commit()
+        self.logger.info(f"{EmbeddingCache.__name__} initiated.")
+
+
+    def get_many(self, model: str, hashes: list[str]) -> dict[str, np.ndarray]:
+        if not hashes:
+            return {}
+        unique = list(dict.fromkeys(hashes))
+        found = {}
+        with self.lock:
+            # sqlite limits the number of bound parameters per statement.
+            for i in range(0, len(unique), 500):
+                batch = unique[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.conn.execute(
+                    f"SELECT text_hash, embedding FROM embedding_cache WHERE model = ? AND text_hash IN ({placeholders})",
+                    (model, *batch)
+                ).fetchall()
+                found.update({row[0]: np.frombuffer(row[1], dtype=np.float32) for row in rows})
+            if found:
+                now = time.time()
+                self.conn.executemany(
+                    "UPDATE embedding_cache SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, h) for h in found]
+                )
+                self.conn.commit()
+
+        return found
+
+
+    def put_many(self, model: str, embeddings: dict[str, np.ndarray]) -> None:
+        if not embeddings:
+            return
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (model, text_hash, embedding, last_used) VALUES (?, ?, ?, ?)",
+                [(model, h, np.asarray(vector, dtype=np.float32).tobytes(), now) for h, vector in embeddings.items()]
+            )
+            self._evict()
+            self.conn.commit()
+
+        return
+
+
+    # drop least recently used entries once the cache grows past max_entries.
+    def _evict(self) -> None:
+        count = self.conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        excess = count - int(self.max_entries * 0.9)
+        self.conn.execute(
+            """
+            DELETE FROM embedding_cache WHERE rowid IN (
+                SELECT rowid FROM embedding_cache ORDER BY last_used ASC LIMIT ?
+            )
+            """,
+            (excess,)
+        )
+        self.logger.info(f"{EmbeddingCache.__name__}: evicted {excess} least recently used embeddings.")
+
+        return
+
+
+class CachedOllamaEmbeddingFunction(OllamaEmbeddingFunction):
+    def __init__(self, cache: EmbeddingCache, url: str, model_name: str, **kwargs):
+        super().__init__(url=url, model_name=model_name, **kwargs)
+        self.cache = cache
+        self.cache_model_name = model_name
+        self.hits = 0
+        self.misses = 0
+
+
+    # serve cached embeddings and only send misses to ollama.
+    def __call__(self, input: Documents) -> Embeddings:
+        hashes = [text_hash(text) for text in input]
+        cached = self.cache.get_many(model=self.cache_model_name, hashes=hashes)
+
+        missing = {}
+        for h, text in zip(hashes, input):
+            if h not in cached and h not in missing:
+                missing[h] = text
+        if missing:
+            with metrics.span("embedding"):
+                computed = super().__call__(list(missing.values()))
+            fresh = dict(zip(missing.keys(), (np.asarray(vector, dtype=np.float32) for vector in computed)))
+            self.cache.put_many(model=self.cache_model_name, embeddings=fresh)
+            cached.update(fresh)
+
+        hits = len(input) - len(missing)
+        self.hits += hits
+        self.misses += len(missing)
+        metrics.inc("embedding_cache_hits", hits)
+        metrics.inc("embedding_cache_misses", len(missing))
+        self.cache.logger.debug(
+            "%s: %d hits, %d misses (total %d hits / %d misses).",
+            CachedOllamaEmbeddingFunction.__name__, hits, len(missing), self.hits, self.misses
+        )
+
+        return [cached[h] for h in hashes]
+
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
@@ -0,0 +1,186 @@
+from urllib.parse import urlparse
+import asyncio
+
+import httpx
+import lxml.html
+
+from tools.Metrics import metrics
+
+import os
+
+
+# the elements the browser crawl targets, as xpath so lxml needs no cssselect.
+DATE_PAGE_XPATH = '//div[@class="leftBody"]'
+HEADLINE_XPATH = '//span[@id="PRHeadlineSpan"]'
+PRESS_RELEASE_XPATH = '//span[@id="pressrelease"]'
+
+
+class FetchedPage:
+    """The subset of crawl4ai's CrawlResult the crawl pipeline reads."""
+
+    def __init__(self, url: str, success: bool, status_code: int | None = None, markdown: str = "",
+                 metadata: dict | None = None, links: dict | None = None, error_message: str | None = None,
+                 not_modified: bool = False):
+        self.url = url
+        self.success = success
+        self.status_code = status_code
+        self.markdown = markdown
+        self.metadata = metadata or {}
+        self.links = links or {"internal": [], "external": []}
+        self.error_message = error_message
+        self.not_modified = not_modified
+
+
+def _element_text(element) -> str:
+    # <br> and block elements become line breaks, other whitespace collapses like a browser would render it.
+    for br in element.iter("br"):
+        br.tail = "\n" + (br.tail or "")
+    for block in element.iter("p", "div", "li", "tr", "h1", "h2", "h3", "h4"):
+        block.tail = "\n\n" + (block.tail or "")
+    lines = (" ".join(line.split()) for line in element.text_content().split("\n"))
+
+    text, blank = [], False
+    for line in lines:
+        if line:
+            text.append(line)
+            blank = False
+        elif not blank and text:
+            text.append("")
+            blank = True
+
+    return "\n".join(text).strip()
+
+
+def _page_title(document) -> str:
+    titles = document.xpath("//title")
+    return " ".join(titles[0].text_content().split()) if titles else ""
+
+
+# parse a daily index page into the links of its leftBody, split like CrawlResult.links.
+def parse_date_page(url: str, html: bytes | str) -> FetchedPage:
+    document = lxml.html.fromstring(html, base_url=url)
+    containers = document.xpath(DATE_PAGE_XPATH)
+    if not containers:
+        return FetchedPage(url=url, success=False, status_code=200, error_message="no leftBody element on date page")
+
+    host = urlparse(url).netloc
+    links = {"internal": [], "external": []}
+    for container in containers:
+        container.make_links_absolute(url)
+        for anchor in container.xpath(".//a[@href]"):
+            href = anchor.get("href")
+            kind = "internal" if urlparse(href).netloc == host else "external"
+            links[kind].append({"href": href, "text": " ".join(anchor.text_content().split())})
+
+    return FetchedPage(
+        url=url,
+        success=True,
+        status_code=200,
+        markdown="\n\n".join(_element_text(container) for container in containers),
+        metadata={"title": _page_title(document)},
+        links=links
+    )
+
+
+# parse a press release page into "# headline" followed by the release text.
+def parse_news_page(url: str, html: bytes | str) -> FetchedPage:
+    document = lxml.html.fromstring(html, base_url=url)
+    bodies = document.xpath(PRESS_RELEASE_XPATH)
+    if not bodies:
+        return FetchedPage(url=url, success=False, status_code=200, error_message="no pressrelease element on news page")
+
+    headlines = document.xpath(HEADLINE_XPATH)
+    parts = [f"# {_element_text(headlines[0])}"] if headlines else []
+    parts.append(_element_text(bodies[0]))
+
+    return FetchedPage(
+        url=url,
+        success=True,
+        status_code=200,
+        markdown="\n\n".join(parts),
+        metadata={"title": _page_title(document)}
+    )
+
+
+PAGE_PARSERS = {"date": parse_date_page, "news": parse_news_page}
+
+
+class HttpFetcher:
+    def __init__(self, logger, raw_store):
+        self.logger = logger
+        self.raw_store = raw_store
+
+        # http fetch config.
+        self.timeout = float(os.getenv("http_timeout", "20"))
+        self.max_connections = int(os.getenv("http_max_connections", "16"))
+        self.user_agent = os.getenv("http_user_agent", "Mozilla/5.0 (compatible; GovMediaSummary/0.1)")
+        self.client: httpx.AsyncClient | None = None
+        self.loop = None
+
+        self.logger.info(f"{HttpFetcher.__name__} initiated.")
+
+
+    # the connection pool belongs to the running event loop, so rebuild it when asyncio.run starts a new one.
+    def _bind_loop(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self.client is None or self.loop is not loop:
+            self.loop = loop
+            self.client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": self.user_agent},
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+            )
+
+        return self.client
+
+
+    # conditional GET against the raw page store; a 304 re-parses the stored copy.
+    async def fetch(self, url: str, kind: str) -> FetchedPage:
+        client = self._bind_loop()
+        headers = {}
+        validators = self.raw_store.get_validators(url)
+        if validators:
+            etag, last_modified = validators
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        try:
+            response = await client.get(url, headers=headers)
+        except httpx.HTTPError as e:
+            return FetchedPage(url=url, success=False, error_message=f"{type(e).__name__}: {e}")
+
+        if response.status_code == 304 and validators:
+            stored = self.raw_store.get(url)
+            self.raw_store.touch(url)
+            metrics.inc("http_not_modified")
+            page = PAGE_PARSERS[kind](url=url, html=stored["content"])
+            page.not_modified = True
+            self.logger.debug("%s: %s %s not modified, using stored copy.", HttpFetcher.__name__, kind, url)
+            return page
+        if response.status_code != 200:
+            return FetchedPage(url=str(response.url), success=False, status_code=response.status_code, error_message=f"HTTP {response.status_code}")
+
+        metrics.inc("http_bytes_fetched", len(response.content))
+        page = PAGE_PARSERS[kind](url=str(response.url), html=response.content)
+        if page.success:
+            self.raw_store.put(
+                url=url,
+                kind=kind,
+                content=response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
+        self.logger.debug("%s: %s %s -> %d bytes, success=%s.", HttpFetcher.__name__, kind, url, len(response.content), page.success)
+
+        return page
+
+
+    async def aclose(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+            self.loop = None
+
+        return
@@ -0,0 +1,64 @@
+from tools.DataProcessor import date_to_unix
+
+from collections import defaultdict
+
+import os
+
+
+class HybridRetriever:
+    def __init__(self, logger, db_handler, lexical_index):
+        self.logger = logger
+        self.db_handler = db_handler
+        self.lexical_index = lexical_index
+
+        # fusion config.
+        self.rrf_k = int(os.getenv("hybrid_rrf_k", "60"))
+        self.candidate_factor = int(os.getenv("hybrid_candidate_factor", "5"))
+
+        # backfill the lexical index for chunks stored before it existed.
+        if self.lexical_index.count() == 0 and self.db_handler.count() > 0:
+            self.db_handler.reindex_lexical()
+
+        self.logger.info(f"{HybridRetriever.__name__} initiated.")
+
+
+    # reciprocal rank fusion of ranked id lists.
+    def _fuse(self, rankings: list[list[str]]) -> list[tuple[str, float]]:
+        scores: dict[str, float] = defaultdict(float)
+        for ranking in rankings:
+            for rank, doc_id in enumerate(ranking):
+                scores[doc_id] += 1.0 / (self.rrf_k + rank + 1)
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+    def search_records_hybrid(self, keyword: str, start_date: str | None = None, end_date: str | None = None, k: int = 10) -> dict:
+        start_unix = date_to_unix(start_date) if start_date else None
+        end_unix = date_to_unix(end_date) if end_date else None
+        n_candidates = k * self.candidate_factor
+
+        lexical_ids = [doc_id for doc_id, _ in self.lexical_index.search(
+            query=keyword, limit=n_candidates, start_unix=start_unix, end_unix=end_unix
+        )]
+        vector_ids = self.db_handler.query_chunk_ids(
+            query=keyword, n_results=n_candidates, start_unix=start_unix, end_unix=end_unix
+        )
+        fused = self._fuse([lexical_ids, vector_ids])[:k]
+        self.logger.info(f"{HybridRetriever.__name__}: '{keyword}' -> {len(lexical_ids)} lexical, {len(vector_ids)} vector, {len(fused)} fused hits.")
+
+        if not fused:
+            return {"ids": [], "documents": [], "metadatas": [], "scores": []}
+        records = self.db_handler.get_chunks(ids=[doc_id for doc_id, _ in fused], include=["documents", "metadatas"])
+        by_id = {
+            doc_id: (document, metadata)
+            for doc_id, document, metadata in zip(records["ids"], records["documents"], records["metadatas"])
+        }
+        hits = [(doc_id, score) for doc_id, score in fused if doc_id in by_id]
+        articles = self.db_handler.article_store.get_articles(news_ids=list({by_id[doc_id][1]["news_id"] for doc_id, _ in hits}))
+
+        return {
+            "ids": [doc_id for doc_id, _ in hits],
+            "documents": [by_id[doc_id][0] for doc_id, _ in hits],
+            "metadatas": [{**articles.get(by_id[doc_id][1]["news_id"], {}), **by_id[doc_id][1]} for doc_id, _ in hits],
+            "scores": [score for _, score in hits]
+        }
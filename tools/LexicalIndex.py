@@ -0,0 +1,137 @@
+import sqlite3
+import threading
+import math
+import re
+from collections import Counter, defaultdict
+
+import os
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?|[一-鿿]")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _field_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(item) for item in value)
+    return str(value)
+
+
+class LexicalIndex:
+    def __init__(self, logger):
+        self.logger = logger
+
+        # bm25 config.
+        self.k1 = 1.5
+        self.b = 0.75
+
+        # index config.
+        self.index_path = os.getenv("lexical_index_path", "./lexical_index.db")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.index_path, check_same_thread=False)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS lex_docs (
+                doc_id TEXT PRIMARY KEY,
+                news_id TEXT NOT NULL,
+                pub_date INTEGER,
+                length INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS lex_postings (
+                term TEXT NOT NULL,
+                doc_id TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_lex_postings_doc ON lex_postings (doc_id);
+            CREATE INDEX IF NOT EXISTS idx_lex_docs_pub_date ON lex_docs (pub_date);
+            """
+        )
+        self.conn.commit()
+        self.logger.info(f"{LexicalIndex.__name__} initiated.")
+
+
+    def count(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM lex_docs").fetchone()[0]
+
+
+    # index chunk text together with title, keywords and organizations.
+    def add(self, ids: list[str], documents: list[str], metadatas: list[dict], articles: dict[str, dict]) -> None:
+        docs, postings = [], []
+        for doc_id, document, metadata in zip(ids, documents, metadatas):
+            article = articles.get(metadata["news_id"], {})
+            text = " ".join([
+                document or "",
+                _field_text(article.get("title")),
+                _field_text(article.get("keywords")),
+                _field_text(article.get("organizations"))
+            ])
+            terms = Counter(tokenize(text))
+            docs.append((doc_id, metadata["news_id"], metadata.get("pub_date"), sum(terms.values())))
+            postings.extend((term, doc_id, tf) for term, tf in terms.items())
+
+        with self.lock:
+            self.conn.executemany("DELETE FROM lex_postings WHERE doc_id = ?", [(doc[0],) for doc in docs])
+            self.conn.executemany("INSERT OR REPLACE INTO lex_docs (doc_id, news_id, pub_date, length) VALUES (?, ?, ?, ?)", docs)
+            self.conn.executemany("INSERT INTO lex_postings (term, doc_id, tf) VALUES (?, ?, ?)", postings)
+            self.conn.commit()
+        self.logger.debug("%s: indexed %d chunks.", LexicalIndex.__name__, len(docs))
+
+        return
+
+
+    def delete(self, ids: list[str]) -> None:
+        with self.lock:
+            self.conn.executemany("DELETE FROM lex_postings WHERE doc_id = ?", [(doc_id,) for doc_id in ids])
+            self.conn.executemany("DELETE FROM lex_docs WHERE doc_id = ?", [(doc_id,) for doc_id in ids])
+            self.conn.commit()
+        self.logger.debug("%s: removed %d chunks.", LexicalIndex.__name__, len(ids))
+
+        return
+
+
+    def search(self, query: str, limit: int = 50, start_unix: int | None = None, end_unix: int | None = None) -> list[tuple[str, float]]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        date_filter, date_params = "", []
+        if start_unix is not None:
+            date_filter += " AND d.pub_date >= ?"
+            date_params.append(start_unix)
+        if end_unix is not None:
+            date_filter += " AND d.pub_date <= ?"
+            date_params.append(end_unix)
+
+        scores: dict[str, float] = defaultdict(float)
+        with self.lock:
+            total_docs, avg_length = self.conn.execute("SELECT COUNT(*), AVG(length) FROM lex_docs").fetchone()
+            if not total_docs:
+                return []
+            for term in terms:
+                df = self.conn.execute("SELECT COUNT(*) FROM lex_postings WHERE term = ?", (term,)).fetchone()[0]
+                if not df:
+                    continue
+                idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+                rows = self.conn.execute(
+                    f"""
+                    SELECT p.doc_id, p.tf, d.length FROM lex_postings p
+                    JOIN lex_docs d ON d.doc_id = p.doc_id
+                    WHERE p.term = ?{date_filter}
+                    """,
+                    (term, *date_params)
+                ).fetchall()
+                for doc_id, tf, length in rows:
+                    norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
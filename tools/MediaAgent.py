@@ -1,60 +1,268 @@
-from langchain_ollama.chat_models import ChatOllama
-from langchain_community.tools import StructuredTool, tool
-from langchain_classic.agents import initialize_agent, AgentType
-from langchain_classic.load.dump import dumps
-
-
-from tools.NewsCrawler import NewsCrawler
-from tools.DocumentGenerator import DocumentGenerator
-from tools.ChromaDBHandler import ChromaDBHandler
+from tools.ComponentRegistry import ComponentRegistry
 from tools.logger import Logger
+from tools.Metrics import metrics
 
 from datetime import date
 import os
-from dotenv import load_dotenv
-load_dotenv()
 
 
 class MediaAgent:
-    def __init__(self): 
+    def __init__(self):
         self.model_name = os.getenv("ollama_llm_model")
+        self.Logger = Logger(__name__).get_logger()
+        self.use_planner = os.getenv("use_query_planner", "true").lower() == "true"
+        self._agent = None
+
+        # every subsystem is imported and built on first use, so a query session never loads the crawler stack.
+        self.registry = ComponentRegistry(logger=self.Logger)
+        self.registry.register("lexical_index", self._build_lexical_index)
+        self.registry.register("article_store", self._build_article_store)
+        self.registry.register("rollup_store", self._build_rollup_store)
+        self.registry.register("db_handler", self._build_db_handler)
+        self.registry.register("retriever", self._build_retriever)
+        self.registry.register("document_generator", self._build_document_generator)
+        self.registry.register("ledger", self._build_ledger)
+        self.registry.register("extractor", self._build_extractor)
+        self.registry.register("rate_limiter", self._build_rate_limiter)
+        self.registry.register("raw_store", self._build_raw_store)
+        self.registry.register("http_fetcher", self._build_http_fetcher)
+        self.registry.register("crawler", self._build_crawler)
+        self.registry.register("backfill_scheduler", self._build_backfill_scheduler)
+        self.registry.register("report_engine", self._build_report_engine)
+        self.registry.register("watcher", self._build_watcher)
+        self.registry.register("response_cache", self._build_response_cache)
+        self.registry.register("planner", self._build_planner)
+
+        self.Logger.info(f"{MediaAgent.__name__} initiated.")
+
+
+    # component factories.
+    def _build_lexical_index(self):
+        from tools.LexicalIndex import LexicalIndex
+        return LexicalIndex(logger=self.Logger)
+
+    def _build_article_store(self):
+        from tools.ArticleStore import ArticleStore
+        return ArticleStore(logger=self.Logger)
+
+    def _build_rollup_store(self):
+        from tools.RollupStore import RollupStore
+        return RollupStore(logger=self.Logger, article_store=self.article_store)
+
+    def _build_db_handler(self):
+        from tools.ChromaDBHandler import ChromaDBHandler
+        return ChromaDBHandler(logger=self.Logger, lexical_index=self.lexical_index, article_store=self.article_store, rollup_store=self.rollup_store)
+
+    def _build_retriever(self):
+        from tools.HybridRetriever import HybridRetriever
+        return HybridRetriever(logger=self.Logger, db_handler=self.DBHandler, lexical_index=self.lexical_index)
+
+    def _build_document_generator(self):
+        from tools.DocumentGenerator import DocumentGenerator
+        return DocumentGenerator(logger=self.Logger)
+
+    def _build_ledger(self):
+        from tools.CrawlLedger import CrawlLedger
+        return CrawlLedger(logger=self.Logger)
+
+    def _build_extractor(self):
+        from tools.NewsExtractor import NewsExtractor
+        return NewsExtractor(logger=self.Logger)
+
+    def _build_rate_limiter(self):
+        from tools.RateLimiter import AdaptiveRateLimiter
+        return AdaptiveRateLimiter(logger=self.Logger)
+
+    def _build_raw_store(self):
+        from tools.RawPageStore import RawPageStore
+        return RawPageStore(logger=self.Logger)
+
+    def _build_http_fetcher(self):
+        from tools.HttpFetcher import HttpFetcher
+        return HttpFetcher(logger=self.Logger, raw_store=self.raw_store)
+
+    def _build_crawler(self):
+        from tools.NewsCrawler import NewsCrawler
+        return NewsCrawler(
+            logger=self.Logger,
+            db_handler=self.DBHandler,
+            document_generator=self.document_generator,
+            ledger=self.ledger,
+            extractor=self.extractor,
+            rate_limiter=self.rate_limiter,
+            http_fetcher=self.http_fetcher,
+            raw_store=self.raw_store
+            )
+
+    def _build_backfill_scheduler(self):
+        from tools.BackfillScheduler import BackfillScheduler
+        return BackfillScheduler(logger=self.Logger, crawler=self.Crawler)
+
+    def _build_report_engine(self):
+        from tools.ReportEngine import ReportEngine
+        return ReportEngine(logger=self.Logger, article_store=self.article_store)
+
+    def _build_watcher(self):
+        from tools.NewsWatcher import NewsWatcher
+        # reading the status file must not start the crawler.
+        return NewsWatcher(logger=self.Logger, crawler=self.registry.proxy("crawler"), article_store=self.registry.proxy("article_store"))
+
+    def _build_response_cache(self):
+        from tools.ResponseCache import ResponseCache
+        return ResponseCache(
+            logger=self.Logger,
+            # chroma and the embedding client are only built for the first semantic lookup.
+            embedding_function=lambda texts: self.DBHandler.embedding_function(texts),
+            article_store=self.article_store
+            )
+
+    def _build_planner(self):
+        from tools.QueryPlanner import QueryPlanner
+        return QueryPlanner(
+            logger=self.Logger,
+            crawler=self.registry.proxy("crawler"),
+            db_handler=self.registry.proxy("db_handler"),
+            retriever=self.registry.proxy("retriever"),
+            rollup_store=self.registry.proxy("rollup_store")
+            )
+
+
+    # components, built on first access.
+    @property
+    def lexical_index(self):
+        return self.registry.get("lexical_index")
+
+    @property
+    def article_store(self):
+        return self.registry.get("article_store")
+
+    @property
+    def rollup_store(self):
+        return self.registry.get("rollup_store")
+
+    @property
+    def DBHandler(self):
+        return self.registry.get("db_handler")
+
+    @property
+    def retriever(self):
+        return self.registry.get("retriever")
+
+    @property
+    def document_generator(self):
+        return self.registry.get("document_generator")
+
+    @property
+    def ledger(self):
+        return self.registry.get("ledger")
+
+    @property
+    def extractor(self):
+        return self.registry.get("extractor")
+
+    @property
+    def rate_limiter(self):
+        return self.registry.get("rate_limiter")
+
+    @property
+    def raw_store(self):
+        return self.registry.get("raw_store")
+
+    @property
+    def http_fetcher(self):
+        return self.registry.get("http_fetcher")
+
+    @property
+    def Crawler(self):
+        return self.registry.get("crawler")
+
+    @property
+    def backfill_scheduler(self):
+        return self.registry.get("backfill_scheduler")
+
+    @property
+    def report_engine(self):
+        return self.registry.get("report_engine")
+
+    @property
+    def watcher(self):
+        return self.registry.get("watcher")
+
+    @property
+    def response_cache(self):
+        return self.registry.get("response_cache")
+
+    @property
+    def planner(self):
+        return self.registry.get("planner")
+
+
+    # the langchain agent is only built when a query falls through the cache and the planner.
+    @property
+    def agent(self):
+        if self._agent is None:
+            with metrics.span("init_agent"):
+                self._agent = self._build_agent()
+        return self._agent
+
+    def _build_agent(self):
+        from langchain_ollama.chat_models import ChatOllama
+        from langchain_community.tools import StructuredTool, tool
+        from langchain_classic.agents import initialize_agent, AgentType
+
         self.llm = ChatOllama(
             model=self.model_name,
             temperature=0.1
             )
-        self.Logger = Logger(__name__).get_logger()
-        self.DBHandler = ChromaDBHandler(logger=self.Logger)
-        self.document_generator = DocumentGenerator(logger=self.Logger)
-        self.Crawler = NewsCrawler(
-            logger=self.Logger, 
-            db_handler=self.DBHandler,
-            document_generator=self.document_generator   # to be implemented
-            )
-        self.tools = [self.get_current_date]
+        self.tools = [tool(self.get_current_date)]
         self.structuredtools = [
             StructuredTool.from_function(
-                func=self.Crawler.fetch_news_by_dates,
+                func=self.fetch_news_by_dates,
                 name="fetch_news_by_dates",
-                description="crawl news from startDate to endDate. startDate and endDate are in 'YYYYMMDD' string format, e.g. '20260801'"
+                description="crawl news from startDate to endDate. startDate and endDate are in 'YYYYMMDD' string format, e.g. '20260801'. Only needed for dates not ingested yet; check get_ingestion_status first, recent days are kept up to date by watch mode."
+            ),
+            StructuredTool.from_function(
+                func=self.watcher.read_status,
+                name="get_ingestion_status",
+                description="return the watch mode status: whether it is running, the last successful poll time, days covered and press releases ingested. Use it to decide whether recent dates still need fetch_news_by_dates."
             ),
             StructuredTool.from_function(
                 func=self.DBHandler.check_records_by_dates,
                 name="check_records_by_dates",
-                description="check any records from startDate to endDate in ChromaDB"
+                description="list press releases from start_date to end_date in ChromaDB, one record per press release, dates in 'Month DD, YYYY' format. Returns total, records and next_offset; page with limit/offset and choose fields from title, pub_date, pub_time, url, summary, keywords, organizations, document."
             ),
             StructuredTool.from_function(
                 func=self.DBHandler.check_records_by_keyword,
                 name="check_records_by_keyword",
-                description="check any records by keyword (e.g. organization, topic) in ChromaDB"
+                description="list press releases by keyword (e.g. organization, topic) in ChromaDB, one record per press release. Returns total, records and next_offset; page with limit/offset and choose fields from title, pub_date, pub_time, url, summary, keywords, organizations, document."
             ),
             StructuredTool.from_function(
                 func=self.DBHandler.check_records_by_keyword_and_dates,
                 name="check_records_by_keyword_dates",
-                description="check any records by keyword and dates in ChromaDB"
+                description="list press releases by keyword and dates in ChromaDB, one record per press release, dates in 'Month DD, YYYY' format. Returns total, records and next_offset; page with limit/offset and choose fields from title, pub_date, pub_time, url, summary, keywords, organizations, document."
+            ),
+            StructuredTool.from_function(
+                func=self.rollup_store.aggregate_records,
+                name="aggregate_records",
+                description="count press releases from start_date to end_date in 'Month DD, YYYY' format (both optional), grouped by 'organization', 'keyword' or 'all'. Optionally filter groups by name, add a per 'day'/'week'/'month' trend with interval, and include news ids with with_ids. Use it for 'how many' and trend questions instead of listing records."
+            ),
+            StructuredTool.from_function(
+                func=self.retriever.search_records_hybrid,
+                name="search_records_hybrid",
+                description="search records by keyword (e.g. department name, bill title, topic) combining exact keyword matching and semantic search, optionally between start_date and end_date in 'Month DD, YYYY' format, e.g. 'August 01, 2026'. Returns the top k chunks."
+            ),
+            StructuredTool.from_function(
+                func=self.generate_report,
+                name="generate_report",
+                description="write a markdown media summary report (e.g. a weekly digest) of press releases from start_date to end_date in 'Month DD, YYYY' format, grouped by 'organization' or 'topic'. Returns the report file name."
             )
         ] # add more tools, e.g. retriever, summary generator.
-        
-        self.agent = initialize_agent(
+
+        # time every tool invocation.
+        for structuredtool in self.structuredtools:
+            structuredtool.func = metrics.timed(f"tool_{structuredtool.name}")(structuredtool.func)
+
+        return initialize_agent(
             llm=self.llm,
             agent=AgentType.STRUCTURED_CHAT_ZERO_SHOT_REACT_DESCRIPTION,
             verbose=True,
@@ -62,20 +270,55 @@ class MediaAgent:
             handling_parsing_errors=True,
             tools=self.structuredtools + self.tools
         )
-    
-    @tool
+
+
+    # tool entry points that only build the crawler or report engine when the agent calls them.
+    def fetch_news_by_dates(self, startDate: str, endDate: str) -> None:
+        return self.Crawler.fetch_news_by_dates(startDate=startDate, endDate=endDate)
+
+    def generate_report(self, start_date: str, end_date: str, group_by: str = "organization") -> dict:
+        return self.report_engine.generate_report(start_date=start_date, end_date=end_date, group_by=group_by)
+
+    @staticmethod
     def get_current_date() -> str:
         """Return today's date in ISO format (YYYY-MM-DD)."""
         return date.today().isoformat()
-     
-     
+
+
+    # serve repeated questions from the response cache, then try the one-call planner, and only then the agent.
+    def answer(self, query: str) -> dict:
+        cached = self.response_cache.lookup(query=query)
+        if cached is not None:
+            return cached
+
+        planned = self.planner.try_answer(query=query) if self.use_planner else None
+        if planned is not None:
+            result, (start_unix, end_unix) = planned
+            self.response_cache.store(query=query, response=result, start_unix=start_unix, end_unix=end_unix)
+            return result
+
+        from langchain_classic.load.dump import dumps
+        from tools.ResponseCache import date_range_from_steps
+
+        with metrics.span("agent_invoke"):
+            response = self.agent.invoke({"input": query})
+        result = {
+            "output": response.get("output"),
+            "intermediate_steps": dumps(response["intermediate_steps"], pretty=True)
+        }
+        start_unix, end_unix = date_range_from_steps(response["intermediate_steps"])
+        self.response_cache.store(query=query, response=result, start_unix=start_unix, end_unix=end_unix)
+
+        return result
+
+
     def chat_loop(self) -> None:
         while True:
             query = input("Enter the query or type 'q' to exit: ")
             if query.lower() == "q":
                 break
-            response = self.agent.invoke({"input": query})
-            print(dumps(response["intermediate_steps"], pretty=True))
-            
+            result = self.answer(query=query)
+            print(result["intermediate_steps"])
+
         return
-    
\ No newline at end of file
+
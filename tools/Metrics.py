@@ -0,0 +1,172 @@
+from collections import defaultdict, deque
+from contextlib import contextmanager
+import functools
+import inspect
+import json
+import statistics
+import threading
+import time
+
+import os
+
+
+# recent samples kept per histogram for percentiles.
+MAX_SAMPLES = 10000
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics_path = os.getenv("metrics_path", "./metrics")
+        self.reset()
+
+
+    def reset(self) -> None:
+        with self.lock:
+            self.counters: dict[str, float] = defaultdict(float)
+            self.histograms: dict[str, dict] = {}
+
+
+    # counters, histograms and spans.
+    def inc(self, name: str, value: float = 1) -> None:
+        with self.lock:
+            self.counters[name] += value
+
+
+    def observe(self, name: str, value: float) -> None:
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = {"count": 0, "sum": 0.0, "max": 0.0, "samples": deque(maxlen=MAX_SAMPLES)}
+            histogram["count"] += 1
+            histogram["sum"] += value
+            histogram["max"] = max(histogram["max"], value)
+            histogram["samples"].append(value)
+
+
+    @contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc(f"{name}_errors")
+            raise
+        finally:
+            self.observe(f"{name}_seconds", time.perf_counter() - start)
+
+
+    # decorator version of span that keeps the wrapped signature (for StructuredTool).
+    def timed(self, name: str):
+        def decorator(func):
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(name):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+    # position of every counter and histogram, so a run can report only what it recorded.
+    def mark(self) -> dict:
+        with self.lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {name: (histogram["count"], histogram["sum"]) for name, histogram in self.histograms.items()}
+            }
+
+
+    # export.
+    def snapshot(self, since: dict | None = None) -> dict:
+        with self.lock:
+            counters = dict(self.counters)
+            histograms = {}
+            for name, histogram in self.histograms.items():
+                count, total = histogram["count"], histogram["sum"]
+                samples = list(histogram["samples"])
+                if since is not None:
+                    count_before, sum_before = since["histograms"].get(name, (0, 0.0))
+                    count, total = count - count_before, total - sum_before
+                    if count <= 0:
+                        continue
+                    samples = samples[-count:]
+                samples.sort()
+                quantiles = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+                histograms[name] = {
+                    "count": count,
+                    "sum": total,
+                    "max": histogram["max"] if since is None else samples[-1],
+                    "p50": quantiles[49],
+                    "p95": quantiles[94]
+                }
+        if since is not None:
+            counters = {
+                name: value - since["counters"].get(name, 0)
+                for name, value in counters.items()
+                if value != since["counters"].get(name, 0)
+            }
+
+        return {"counters": counters, "histograms": histograms}
+
+
+    def to_prometheus(self, snapshot: dict | None = None) -> str:
+        snapshot = snapshot or self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"# TYPE govmedia_{name} counter")
+            lines.append(f"govmedia_{name} {value}")
+        for name, histogram in sorted(snapshot["histograms"].items()):
+            lines.append(f"# TYPE govmedia_{name} summary")
+            lines.append(f'govmedia_{name}{{quantile="0.5"}} {histogram["p50"]}')
+            lines.append(f'govmedia_{name}{{quantile="0.95"}} {histogram["p95"]}')
+            lines.append(f"govmedia_{name}_sum {histogram['sum']}")
+            lines.append(f"govmedia_{name}_count {histogram['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+    def export(self) -> str:
+        snapshot = self.snapshot()
+        os.makedirs(self.metrics_path, exist_ok=True)
+        with open(os.path.join(self.metrics_path, "metrics.json"), "w", encoding="utf-8") as file:
+            json.dump(snapshot, file, indent=2)
+        with open(os.path.join(self.metrics_path, "metrics.prom"), "w", encoding="utf-8") as file:
+            file.write(self.to_prometheus(snapshot))
+
+        return self.metrics_path
+
+
+    def summary_table(self, since: dict | None = None) -> str:
+        snapshot = self.snapshot(since=since)
+        spans = {name: histogram for name, histogram in snapshot["histograms"].items() if name.endswith("_seconds")}
+        values = {name: histogram for name, histogram in snapshot["histograms"].items() if name not in spans}
+        lines = [f"{'span':<32}{'count':>8}{'total s':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+        for name, histogram in sorted(spans.items()):
+            lines.append(
+                f"{name.removesuffix('_seconds'):<32}{histogram['count']:>8}{histogram['sum']:>10.2f}"
+                f"{histogram['p50'] * 1000:>10.1f}{histogram['p95'] * 1000:>10.1f}{histogram['max'] * 1000:>10.1f}"
+            )
+        # histograms of sizes (e.g. tokens) are shown as recorded, not as durations.
+        if values:
+            lines.append(f"{'histogram':<32}{'count':>8}{'total':>10}{'p50':>10}{'p95':>10}{'max':>10}")
+            for name, histogram in sorted(values.items()):
+                lines.append(
+                    f"{name:<32}{histogram['count']:>8}{histogram['sum']:>10.1f}"
+                    f"{histogram['p50']:>10.1f}{histogram['p95']:>10.1f}{histogram['max']:>10.1f}"
+                )
+        lines.append(f"{'counter':<32}{'value':>8}")
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"{name:<32}{value:>8g}")
+
+        return "\n".join(lines)
+
+
+# process-wide registry shared by all pipeline components.
+metrics = Metrics()
@@ -1,80 +1,108 @@
-from unittest import result
-from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode, BrowserConfig, MemoryAdaptiveDispatcher, LLMConfig, LLMExtractionStrategy
-from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
-
-from tools.DataProcessor import generate_date_urls, consolidate_news_urls
+from tools.DataProcessor import generate_date_range, generate_date_urls, consolidate_news_urls, news_id_from_url, page_date_from_url
+from tools.CrawlLedger import STATUS_EXTRACTED, STATUS_FAILED, STATUS_INGESTED, STATUS_NOT_FOUND
+from tools.PressReleaseParser import PressRelease, PressReleaseParseError, parse_press_release
+from tools.Metrics import metrics
+from tools.RateLimiter import THROTTLE_STATUS
+from tools.HttpFetcher import HttpFetcher, parse_news_page
 
 
 from pprint import pformat
-import asyncio, json, re, os
-from pydantic import BaseModel, Field
-from typing import List
+from datetime import date, datetime
+import asyncio, json, re, os, random
+from typing import List, TYPE_CHECKING
+
+# crawl4ai (and playwright) is only imported when a browser is actually started.
+if TYPE_CHECKING:
+    from crawl4ai import AsyncWebCrawler
 
-from dotenv import load_dotenv
-load_dotenv()
 
-class Summary(BaseModel):
-    keywords: List[str] = Field(description="content keywords no more than 5 words")
-    organizations: List[str] = Field(description="all organizations mentioned in the content")
-    summary: str = Field(description="content summary no more than 700 words")
+# starts the headless browser on first use, so http-mode runs that never fall back never launch it.
+class LazyBrowser:
+    def __init__(self, factory):
+        self.factory = factory
+        self.crawler: "AsyncWebCrawler | None" = None
+        self.lock = asyncio.Lock()
+    
+    async def get(self) -> "AsyncWebCrawler":
+        async with self.lock:
+            if self.crawler is None:
+                self.crawler = self.factory()
+                await self.crawler.start()
+        return self.crawler
     
+    async def close(self) -> None:
+        if self.crawler is not None:
+            await self.crawler.close()
+            self.crawler = None
+
    
 class NewsCrawler:
-    def __init__(self, logger, db_handler, document_generator):
+    def __init__(self, logger, db_handler, document_generator, ledger, extractor, rate_limiter, http_fetcher: HttpFetcher, raw_store):
         self.logger = logger
         self.db_handler = db_handler
         self.document_generator = document_generator
-        self.browser_config = BrowserConfig(
-            headless=True,
-            text_mode=True,
-            light_mode=True
-        )
-        self.crawl_config_datePage = CrawlerRunConfig(
-            scraping_strategy=LXMLWebScrapingStrategy(),
-            exclude_all_images=True,
-            exclude_external_links=True,
-            exclude_social_media_domains=True,
-            target_elements=['div[class="leftBody"]'],
-            cache_mode=CacheMode.BYPASS
-        )
-        self.llm_config = LLMConfig(
-            provider=os.getenv("provider"),    # provider="ollama/mistral:latest"
-            temperature=0.1
-        )
-        self.llm_extraction = LLMExtractionStrategy(
-            llm_config=self.llm_config,
-            schema=Summary.model_json_schema(),
-            extraction_type="schema",
-            instruction="Summarize the content no more than 700 words, extract keywords and organizations mentioned.",
-            chunk_token_threshold=1500,
-            overlap_rate=0.1,
-            apply_chunking=True,
-            input_format="markdown",
-            extra_args={"temperature": 0.1, "max_tokens": 1500},
-            verbose=True
-        )
-        self.crawl_config_newsPage = CrawlerRunConfig(
-            scraping_strategy=LXMLWebScrapingStrategy(),
-            exclude_all_images=True,
-            exclude_external_links=True,
-            exclude_social_media_domains=True,
-            target_elements=['span[id="PRHeadlineSpan"]', 'span[id="pressrelease"]'],
-            cache_mode=CacheMode.BYPASS,
-            extraction_strategy=self.llm_extraction,
-            stream=True # Enable streaming 
-        )
-        self.dispatcher = MemoryAdaptiveDispatcher(
-            memory_threshold_percent=80,
-            check_interval=1,
-            max_session_permit=3
-        )
+        self.ledger = ledger
+        self.extractor = extractor
+        self.rate_limiter = rate_limiter
+        self.http_fetcher = http_fetcher
+        self.raw_store = raw_store
+        self.crawl_configs: dict | None = None
+        
+        # fetch engine config: "http" (pooled client + lxml) or "browser" (headless chromium).
+        self.fetch_mode = os.getenv("crawl_fetch_mode", "http")
+        self.browser_fallback = os.getenv("crawl_browser_fallback", "true").lower() == "true"
+        if self.fetch_mode not in ("http", "browser"):
+            raise ValueError(f"Unsupported crawl_fetch_mode '{self.fetch_mode}', expected 'http' or 'browser'.")
+        
+        # pipeline config.
+        self.date_workers = int(os.getenv("crawl_date_workers", "2"))
+        self.news_workers = int(os.getenv("crawl_news_workers", "8"))
+        self.link_queue_size = int(os.getenv("crawl_link_queue_size", "100"))
+        
+        # days younger than this are re-polled for late additions; older polled days are complete.
+        self.repoll_days = int(os.getenv("crawl_repoll_days", "2"))
+        # ingested press releases of those days are re-fetched (a conditional GET in http mode) at most this often; 0 disables.
+        self.revalidate_interval = float(os.getenv("crawl_revalidate_interval", "3600"))
+        
+        # retry config.
+        self.max_retries = int(os.getenv("crawl_max_retries", "4"))
+        if self.max_retries < 1:
+            raise ValueError(f"crawl_max_retries must be at least 1, got {self.max_retries}.")
+        self.backoff_base = float(os.getenv("crawl_backoff_base", "1.0"))
+        self.backoff_max = float(os.getenv("crawl_backoff_max", "30"))
     
     
-    # crawling functions.
-    async def _crawl_date_pages(self, urls: list[str]):
-        async with AsyncWebCrawler(
-            config=self.browser_config,
-            max_concurrency=3, 
+    def _new_browser(self) -> "AsyncWebCrawler":
+        from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode, BrowserConfig
+        from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
+        
+        if self.crawl_configs is None:
+            self.crawl_configs = {
+                "date": CrawlerRunConfig(
+                    scraping_strategy=LXMLWebScrapingStrategy(),
+                    exclude_all_images=True,
+                    exclude_external_links=True,
+                    exclude_social_media_domains=True,
+                    target_elements=['div[class="leftBody"]'],
+                    cache_mode=CacheMode.BYPASS
+                ),
+                "news": CrawlerRunConfig(
+                    scraping_strategy=LXMLWebScrapingStrategy(),
+                    exclude_all_images=True,
+                    exclude_external_links=True,
+                    exclude_social_media_domains=True,
+                    target_elements=['span[id="PRHeadlineSpan"]', 'span[id="pressrelease"]'],
+                    cache_mode=CacheMode.BYPASS
+                )
+            }
+        
+        return AsyncWebCrawler(
+            config=BrowserConfig(
+                headless=True,
+                text_mode=True,
+                light_mode=True
+            ),
+            max_concurrency=self.news_workers, 
             headless=True, 
             disable_images=True, 
             disable_css=True, 
@@ -82,62 +110,396 @@ class NewsCrawler:
             disable_pdf=True, 
             disable_video=True, 
             disable_audio=True, 
-            extraction_mode="light",
-            ) as crawler:
+            extraction_mode="light")
+    
+    
+    # one fetch attempt with the configured engine.
+    async def _fetch_once(self, browser: LazyBrowser, url: str, kind: str):
+        if self.fetch_mode == "http":
+            result = await self.http_fetcher.fetch(url=url, kind=kind)
+            # the page arrived but the expected elements did not, e.g. a layout that needs scripts.
+            if result.success or not self.browser_fallback or result.status_code != 200:
+                return result
+            self.logger.warning("HTTP fetch of %s found no content (%s), falling back to the browser.", url, result.error_message)
+            metrics.inc("fetch_browser_fallbacks")
+        
+        crawler = await browser.get()
+        result = await crawler.arun(url=url, config=self.crawl_configs[kind])
+        # keep the browser's html too, so reprocessing never depends on which engine fetched a page.
+        if result.success and result.html:
+            self.raw_store.put(url=url, kind=kind, content=result.html)
+        
+        return result
+    
+    
+    # fetch a page under the per-host rate limiter, retrying with jittered exponential backoff.
+    # a 404 is returned as is: the page does not exist, which is an answer rather than a failure.
+    async def _fetch(self, browser: LazyBrowser, url: str, kind: str):
+        error = None
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                async with self.rate_limiter.slot(url) as slot:
+                    with metrics.span(f"fetch_{kind}_page"):
+                        result = await self._fetch_once(browser=browser, url=url, kind=kind)
+                    # a missing page says nothing about server load, so it must not cut the host's concurrency.
+                    slot.report(ok=result.success or result.status_code == 404, status_code=result.status_code)
+                if result.success:
+                    self.ledger.remove_dead_letter(url)
+                    return result
+                if result.status_code == 404:
+                    self.logger.info("%s page %s not found.", kind.capitalize(), url)
+                    self.ledger.remove_dead_letter(url)
+                    metrics.inc("fetch_not_found")
+                    return result
+                error = result.error_message or f"HTTP {result.status_code}"
+                # client errors other than throttling will not succeed on retry.
+                if result.status_code and 400 <= result.status_code < 500 and result.status_code not in THROTTLE_STATUS:
+                    break
+            except Exception as e:
+                error = str(e)
             
-            results = await crawler.arun_many(
-                urls=urls,
-                config=self.crawl_config_datePage,
-                dispatcher=self.dispatcher
-            )
-        news_links = consolidate_news_urls(results=results, logger=self.logger)
-        
-        return news_links
+            if attempt < self.max_retries:
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                self.logger.warning("Fetch attempt %d for %s failed (%s), retrying in %.1fs.", attempt, url, error, delay)
+                metrics.inc("fetch_retries")
+                await asyncio.sleep(delay)
+        
+        self.ledger.add_dead_letter(url=url, kind=kind, error=str(error), attempts=attempt)
+        metrics.inc("fetch_dead_lettered")
+        
+        return None
+    
+    
+    # crawling functions.
+    async def _crawl_date_pages(self, browser: LazyBrowser, date_queue: asyncio.Queue, link_queue: asyncio.Queue, seen: set[str]) -> None:
+        while True:
+            url = await date_queue.get()
+            try:
+                result = await self._fetch(browser=browser, url=url, kind="date")
+                if result is None:
+                    self.logger.error(f"Failed to crawl URL: {url}")
+                    metrics.inc("date_pages_failed")
+                    continue
+                if not result.success:
+                    # a recent day may not have its index page yet and is tried again next run;
+                    # a settled day without one never gets it, so record it as polled with no links.
+                    page_date = page_date_from_url(url)
+                    if page_date and self._is_settled(page_date):
+                        self.ledger.record_date_page(page_date=page_date, url=url, news_links=[], complete=True)
+                    metrics.inc("date_pages_not_found")
+                    continue
+                metrics.inc("date_pages_fetched")
+                
+                # remember the day's links, so settled days are not polled again.
+                page_links = consolidate_news_urls(results=[result], logger=self.logger)
+                page_date = page_date_from_url(url)
+                if page_date:
+                    new_links = self.ledger.record_date_page(page_date=page_date, url=url, news_links=page_links, complete=self._is_settled(page_date))
+                    metrics.inc("news_links_new", len(new_links))
+                
+                # push new press release links downstream as soon as the date page is parsed.
+                news_links = [link for link in page_links if link not in seen]
+                seen.update(news_links)
+                pending_ids = set(self.ledger.filter_pending([news_id_from_url(link) for link in news_links]))
+                pending_links = [link for link in news_links if news_id_from_url(link) in pending_ids]
+                # ingested releases of days still being re-polled are checked for corrections.
+                revalidate_links = []
+                if page_date and not self._is_settled(page_date) and self.revalidate_interval > 0:
+                    ingested_ids = [news_id_from_url(link) for link in news_links if news_id_from_url(link) not in pending_ids]
+                    due_ids = set(self.ledger.due_for_revalidation(ingested_ids, interval=self.revalidate_interval))
+                    revalidate_links = [link for link in news_links if news_id_from_url(link) in due_ids]
+                skipped = len(news_links) - len(pending_links) - len(revalidate_links)
+                self.logger.info(
+                    "Crawl ledger: %s has %d already ingested, %d to revalidate, %d pending.",
+                    url, skipped, len(revalidate_links), len(pending_links),
+                    extra={"url": url, "pending": len(pending_links), "revalidate": len(revalidate_links)}
+                )
+                metrics.inc("news_links_discovered", len(news_links))
+                metrics.inc("news_links_skipped_ingested", skipped)
+                metrics.inc("news_links_revalidated", len(revalidate_links))
+                for link in pending_links + revalidate_links:
+                    await link_queue.put(link)
+            except Exception as e:
+                self.logger.error(f"Date page error for {url}: {e}")
+            finally:
+                date_queue.task_done()
  
 
-    async def _crawl_news_pages(self, urls: list[str]) -> None:
-        async with AsyncWebCrawler(
-            config=self.browser_config,
-            max_concurrency=3, 
-            headless=True, 
-            disable_images=True, 
-            disable_css=True, 
-            disable_scripts=True, 
-            disable_pdf=True, 
-            disable_video=True, 
-            disable_audio=True, 
-            extraction_mode="light") as crawler:
-            
-            async for result in await crawler.arun_many(
-                urls=urls,
-                config=self.crawl_config_newsPage,
-                dispatcher=self.dispatcher
-            ):
-            
-                if result.success:
-                    try:
-                        data = json.loads(result.extracted_content)[0]
-                        ids, metadatas, all_splits = self.document_generator.generate_documents(data=data, result=result)
-                        self.db_handler.add_documents_to_chromadb(ids=ids, metadatas=metadatas, documents=all_splits)
-                    except Exception as e:
-                        self.logger.error(f"JSON loading error: {e}")
-                    if not data:
-                        self.logger.error(f"No data extracted from url: {result.url}")
-                        continue
+    async def _crawl_news_pages(self, browser: LazyBrowser, link_queue: asyncio.Queue, page_queue: asyncio.Queue) -> None:
+        while True:
+            url = await link_queue.get()
+            news_id = news_id_from_url(url)
+            try:
+                result = await self._fetch(browser=browser, url=url, kind="news")
+                if result is None:
+                    self.logger.error(f"Failed to crawl URL: {url}")
+                    self.ledger.mark(news_id=news_id, url=url, status=STATUS_FAILED)
+                    metrics.inc("news_pages_failed")
+                    continue
+                if not result.success:
+                    # withdrawn or never published: nothing to ingest and nothing to retry.
+                    if not self.ledger.is_ingested(news_id=news_id):
+                        self.ledger.mark(news_id=news_id, url=url, status=STATUS_NOT_FOUND)
+                    metrics.inc("news_pages_not_found")
+                    continue
+                metrics.inc("news_pages_fetched")
+                
+                # parse once up front, so layout drift fails before any LLM call.
+                with metrics.span("parse"):
+                    release = parse_press_release(url=result.url, title=result.metadata.get("title"), markdown=result.markdown)
+                if self.ledger.is_unchanged(news_id=news_id, text=release.body):
+                    self.logger.info("Crawl ledger: news_id=%s unchanged, skipping extraction.", news_id, extra={"news_id": news_id})
+                    self.ledger.mark_checked(news_id=news_id)
+                    metrics.inc("news_pages_unchanged")
                 else:
-                    self.logger.error(f"Failed to crawl URL: {result.url}")
-            
+                    if self.ledger.is_ingested(news_id=news_id):
+                        # a revalidated release whose body differs from the ingested one: extract and ingest it again.
+                        self.logger.info("Crawl ledger: news_id=%s changed since ingestion, re-extracting.", news_id, extra={"news_id": news_id})
+                        metrics.inc("news_pages_changed")
+                    # blocks when the extraction stage falls behind.
+                    await page_queue.put(release)
+            except PressReleaseParseError as e:
+                self.logger.error(f"Parse error for {e.url}: field={e.field}, reason={e.reason}")
+                self.ledger.mark(news_id=news_id, url=url, status=STATUS_FAILED)
+            except Exception as e:
+                self.logger.error(f"News page error for {url}: {e}")
+            finally:
+                link_queue.task_done()
+    
+    
+    async def _extract_news_pages(self, page_queue: asyncio.Queue) -> None:
+        while True:
+            release = await page_queue.get()
+            try:
+                with metrics.span("llm_extraction"):
+                    data = await self.extractor.extract(content=release.body)
+                self.ledger.mark(news_id=release.news_id, url=release.url, status=STATUS_EXTRACTED, text=release.body)
+                # ingestion is blocking, so run it off the event loop to keep fetching and extracting.
+                await asyncio.to_thread(self._ingest_release, release, data)
+            except Exception as e:
+                self.logger.error(f"Extraction error for {release.url}: {e}")
+                self.ledger.mark(news_id=release.news_id, url=release.url, status=STATUS_FAILED, text=release.body)
+            finally:
+                page_queue.task_done()
+    
+    
+    def _ingest_release(self, release: PressRelease, data: dict) -> None:
+        ids, metadatas, all_splits, article = self.document_generator.generate_documents(data=data, release=release)
+        flushed_ids = self.db_handler.buffer_documents_for_chromadb(ids=ids, metadatas=metadatas, documents=all_splits, article=article)
+        self.ledger.mark_ingested(news_ids=flushed_ids)
+        metrics.inc("articles_ingested", len(flushed_ids))
+        
+        return
+    
+    
+    def _flush_documents(self) -> None:
+        flushed_ids = self.db_handler.flush()
+        self.ledger.mark_ingested(news_ids=flushed_ids)
+        metrics.inc("articles_ingested", len(flushed_ids))
+        
+        return
+    
+    
+    # time-based flush while the pipeline runs, so buffered splits are not held until the next article arrives.
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, self.db_handler.flush_interval / 2))
+            if self.db_handler.flush_due():
+                await asyncio.to_thread(self._flush_documents)
+    
+    
+    async def _crawl_pipeline(self, urls: list[str], news_urls: list[str] | None = None) -> None:
+        browser = LazyBrowser(factory=self._new_browser)
+        date_queue: asyncio.Queue = asyncio.Queue()
+        link_queue: asyncio.Queue = asyncio.Queue(maxsize=self.link_queue_size)
+        page_queue: asyncio.Queue = asyncio.Queue(maxsize=self.extractor.queue_size)
+        seen: set[str] = set()
+        for url in urls:
+            date_queue.put_nowait(url)
+        
+        workers = [
+            asyncio.create_task(self._crawl_date_pages(browser, date_queue, link_queue, seen))
+            for _ in range(self.date_workers)
+        ] + [
+            asyncio.create_task(self._crawl_news_pages(browser, link_queue, page_queue))
+            for _ in range(self.news_workers)
+        ] + [
+            asyncio.create_task(self._extract_news_pages(page_queue))
+            for _ in range(self.extractor.workers)
+        ] + [asyncio.create_task(self._flush_periodically())]
+        
+        # date pages finish first, then drain the remaining news links and crawled pages.
+        try:
+            for url in news_urls or []:
+                seen.add(url)
+                await link_queue.put(url)
+            await date_queue.join()
+            await link_queue.join()
+            await page_queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await browser.close()
+            # final flush of buffered documents.
+            await asyncio.to_thread(self._flush_documents)
+        
         return None
     
     
-
-    def fetch_news_by_dates(self, startDate: str, endDate: str) -> None:
+    def _is_settled(self, page_date: str) -> bool:
+        return (date.today() - datetime.strptime(page_date, "%Y%m%d").date()).days >= self.repoll_days
+    
+    
+    # skip index pages of complete days; their known links that are not ingested yet go straight to the news workers.
+    def _plan_date_pages(self, urls: list[str]) -> tuple[list[str], list[str]]:
+        page_dates = {url: page_date_from_url(url) for url in urls}
+        complete = self.ledger.complete_days([page_date for page_date in page_dates.values() if page_date])
+        poll_urls = [url for url in urls if page_dates[url] not in complete]
+        
+        known_links = self.ledger.known_links(sorted(complete))
+        # a release that was not found on a complete day will not appear later.
+        pending_ids = set(self.ledger.filter_pending(
+            [news_id_from_url(link) for link in known_links],
+            done_statuses=(STATUS_INGESTED, STATUS_NOT_FOUND)
+        ))
+        news_urls = [
+            link for link in known_links
+            if news_id_from_url(link) in pending_ids and link not in self.ledger.dead_letter_urls
+        ]
+        self.logger.info(
+            "Date index: polling %d of %d days, %d complete days skipped with %d known links still pending.",
+            len(poll_urls), len(urls), len(complete), len(news_urls)
+        )
+        metrics.inc("date_pages_skipped_complete", len(complete))
+        
+        return poll_urls, news_urls
+    
+    
+    async def afetch_news_by_dates(self, startDate: str, endDate: str) -> None:
         urls = generate_date_urls(startDate=startDate, endDate=endDate, logger=self.logger)
+        urls, news_urls = self._plan_date_pages(urls=urls)
     
-        # crawl page links of press release.
-        news_links = asyncio.run(self._crawl_date_pages(urls=urls))
+        # crawl date pages and press releases in a single streaming pipeline, then save results to chromadb.
+        with metrics.span("fetch_news_by_dates"):
+            await self._crawl_pipeline(urls=urls, news_urls=news_urls)
+        
+        return
+    
+    
+    # close the http connection pool before asyncio.run tears down its event loop.
+    async def _close_after(self, coro):
+        try:
+            return await coro
+        finally:
+            await self.http_fetcher.aclose()
+    
+    
+    def fetch_news_by_dates(self, startDate: str, endDate: str) -> None:
+        mark = metrics.mark()
+        asyncio.run(self._close_after(self.afetch_news_by_dates(startDate=startDate, endDate=endDate)))
         
-        # get the data dictionaries from press releases and save results to chromadb.
-        asyncio.run(self._crawl_news_pages(urls=news_links))
+        # per-stage timings of this run.
+        summary = metrics.summary_table(since=mark)
+        metrics_path = metrics.export()
+        self.logger.info(f"Crawl metrics (exported to {metrics_path}):\n{summary}")
+        print(summary)
+        
+        return
+    
+    
+    # crawl only days whose index page was never polled, up to today; recent days are left to watch mode.
+    async def afetch_missing_dates(self, startDate: str, endDate: str) -> list[str]:
+        endDate = min(endDate, date.today().strftime("%Y%m%d"))
+        if startDate > endDate:
+            return []
+        dates = generate_date_range(startDate=startDate, endDate=endDate, logger=self.logger)
+        polled = self.ledger.polled_days(dates)
+        missing = [page_date for page_date in dates if page_date not in polled]
+        if missing:
+            self.logger.info("Crawling %d of %d requested days that were never polled.", len(missing), len(dates))
+            await self.afetch_news_by_dates(startDate=missing[0], endDate=missing[-1])
+        
+        return missing
+    
+    
+    def fetch_missing_dates(self, startDate: str, endDate: str) -> list[str]:
+        return asyncio.run(self._close_after(self.afetch_missing_dates(startDate=startDate, endDate=endDate)))
+    
+    
+    # re-run every dead-lettered date and news page.
+    async def aretry_dead_letters(self) -> None:
+        date_urls = self.ledger.list_dead_letters(kind="date")
+        news_urls = self.ledger.list_dead_letters(kind="news")
+        pending_ids = set(self.ledger.filter_pending([news_id_from_url(url) for url in news_urls]))
+        news_urls = [url for url in news_urls if news_id_from_url(url) in pending_ids]
+        self.logger.info("Retrying %d dead-lettered date pages and %d news pages.", len(date_urls), len(news_urls))
+        
+        with metrics.span("retry_dead_letters"):
+            await self._crawl_pipeline(urls=date_urls, news_urls=news_urls)
+        
+        return
+    
+    
+    def retry_dead_letters(self) -> None:
+        mark = metrics.mark()
+        asyncio.run(self._close_after(self.aretry_dead_letters()))
+        print(metrics.summary_table(since=mark))
+        metrics.export()
+        
+        return
+
+    
+    
+    # rebuild chunks (and optionally summaries) of stored press releases between YYYYMMDD dates, without network access.
+    async def areprocess(self, startDate: str | None = None, endDate: str | None = None, reextract: bool = False) -> dict:
+        page_queue: asyncio.Queue = asyncio.Queue(maxsize=self.extractor.queue_size)
+        workers = [
+            asyncio.create_task(self._extract_news_pages(page_queue))
+            for _ in range(self.extractor.workers)
+        ] if reextract else []
+        workers.append(asyncio.create_task(self._flush_periodically()))
+        counts = {"pages": 0, "reprocessed": 0, "parse_failed": 0, "missing_summary": 0}
+        
+        try:
+            for url, html in self.raw_store.iter_pages(kind="news", start_date=startDate, end_date=endDate):
+                counts["pages"] += 1
+                page = parse_news_page(url=url, html=html)
+                try:
+                    release = parse_press_release(url=url, title=page.metadata.get("title"), markdown=page.markdown)
+                except PressReleaseParseError as e:
+                    self.logger.error(f"Parse error for {e.url}: field={e.field}, reason={e.reason}")
+                    counts["parse_failed"] += 1
+                    continue
+                
+                if reextract:
+                    await page_queue.put(release)
+                else:
+                    # re-chunk only: reuse the stored summary, keywords and organizations.
+                    article = self.db_handler.article_store.get_articles([release.news_id]).get(release.news_id)
+                    if article is None:
+                        self.logger.warning("No stored summary for news_id=%s, use --reextract to summarise it.", release.news_id)
+                        counts["missing_summary"] += 1
+                        continue
+                    await asyncio.to_thread(self._ingest_release, release, article)
+                counts["reprocessed"] += 1
+            await page_queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await asyncio.to_thread(self._flush_documents)
+        
+        self.logger.info("Reprocessed stored press releases: %s", counts)
+        
+        return counts
+    
+    
+    def reprocess(self, startDate: str | None = None, endDate: str | None = None, reextract: bool = False) -> dict:
+        mark = metrics.mark()
+        with metrics.span("reprocess"):
+            counts = asyncio.run(self.areprocess(startDate=startDate, endDate=endDate, reextract=reextract))
+        print(metrics.summary_table(since=mark))
+        metrics.export()
         
-        return
\ No newline at end of file
+        return counts
\ No newline at end of file
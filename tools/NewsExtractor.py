@@ -0,0 +1,181 @@
+from ollama import AsyncClient
+from pydantic import BaseModel, Field
+
+import asyncio
+import json
+import math
+import random
+from typing import List
+
+from tools.Metrics import metrics
+
+import os
+
+
+class Summary(BaseModel):
+    keywords: List[str] = Field(description="content keywords no more than 5 words")
+    organizations: List[str] = Field(description="all organizations mentioned in the content")
+    summary: str = Field(description="content summary no more than 700 words")
+
+
+class NewsExtractor:
+    def __init__(self, logger):
+        self.logger = logger
+
+        # llm config.
+        self.model_name = os.getenv("provider", "ollama/mistral:latest").split("/", 1)[-1]    # provider="ollama/mistral:latest"
+        self.host = os.getenv("ollama_base_url", "http://localhost:11434")
+        self.instruction = "Summarize the content no more than 700 words, extract keywords and organizations mentioned."
+        self.part_instruction = "The content is part {part} of {parts} of one press release. " + self.instruction
+        self.merge_instruction = (
+            "The content is the summaries of consecutive parts of one press release. "
+            "Combine them into one summary of the whole press release no more than 700 words, extract keywords and organizations mentioned."
+        )
+
+        # token budget config: an article that fits the context window is sent in a single call.
+        self.context_tokens = int(os.getenv("extraction_context_tokens", "8192"))
+        self.max_output_tokens = int(os.getenv("extraction_max_output_tokens", "1500"))
+        self.chars_per_token = float(os.getenv("extraction_chars_per_token", "3.5"))
+        self.options = {"temperature": 0.1, "num_predict": self.max_output_tokens, "num_ctx": self.context_tokens}
+        # room left for the article after the instruction, the json schema and the answer.
+        self.overhead_tokens = self.estimate_tokens(self.instruction + json.dumps(Summary.model_json_schema())) + 64
+        self.input_budget = self.context_tokens - self.max_output_tokens - self.overhead_tokens
+
+        # worker pool config.
+        self.workers = int(os.getenv("extraction_workers", "2"))
+        self.queue_size = int(os.getenv("extraction_queue_size", "20"))
+        self.max_retries = int(os.getenv("extraction_max_retries", "3"))
+        self.max_concurrency = int(os.getenv("extraction_max_concurrency", "2"))
+        self._loop = None
+
+        if self.input_budget < 256:
+            raise ValueError(f"extraction_context_tokens={self.context_tokens} leaves no room for the article after {self.max_output_tokens} output tokens.")
+
+        self.logger.info(f"{NewsExtractor.__name__} initiated with model={self.model_name}, workers={self.workers}, input budget={self.input_budget} tokens.")
+
+
+    # async client and concurrency limit are bound to the running event loop.
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self.client = AsyncClient(host=self.host)
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+
+    # conservative character-based estimate; ollama has no tokenize endpoint.
+    def estimate_tokens(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+
+    # split on paragraph (then line, then word) boundaries into parts that fit the input budget.
+    def split(self, content: str) -> list[str]:
+        max_chars = int(self.input_budget * self.chars_per_token)
+        parts, current = [], ""
+        pieces = [content]
+        for separator in ("\n\n", "\n", " "):
+            pieces = [piece for text in pieces for piece in (text.split(separator) if len(text) > max_chars else [text])]
+        for piece in pieces:
+            while len(piece) > max_chars:
+                parts.append(piece[:max_chars])
+                piece = piece[max_chars:]
+            candidate = f"{current}\n\n{piece}" if current else piece
+            if len(candidate) > max_chars:
+                parts.append(current)
+                candidate = piece
+            current = candidate
+        if current:
+            parts.append(current)
+
+        return [part for part in parts if part.strip()]
+
+
+    async def _call_model(self, system: str, content: str) -> dict:
+        self._bind_loop()
+        async with self.semaphore:
+            response = await self.client.chat(
+                model=self.model_name,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": content}
+                ],
+                format=Summary.model_json_schema(),
+                options=self.options
+            )
+        metrics.inc("llm_extraction_calls")
+
+        return Summary.model_validate_json(response.message.content).model_dump()
+
+
+    # retry failed model calls with exponential backoff.
+    async def _call_with_retries(self, system: str, content: str) -> dict:
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                return await self._call_model(system=system, content=content)
+            except Exception as e:
+                metrics.inc("llm_extraction_failures")
+                if attempt == self.max_retries:
+                    raise
+                delay = 2 ** attempt + random.random()
+                self.logger.warning(f"{NewsExtractor.__name__}: attempt {attempt} failed ({e}), retrying in {delay:.1f}s.")
+                await asyncio.sleep(delay)
+
+
+    @staticmethod
+    def _union(lists: list[list[str]]) -> list[str]:
+        seen, merged = set(), []
+        for values in lists:
+            for value in values:
+                key = " ".join(value.split()).casefold()
+                if key and key not in seen:
+                    seen.add(key)
+                    merged.append(value.strip())
+
+        return merged
+
+
+    # partial results of an oversized article: keywords and organizations are unioned, summaries are reduced.
+    async def _merge(self, partials: list[dict]) -> dict:
+        results = list(partials)
+        summaries = [partial["summary"] for partial in partials]
+        combined = "\n\n".join(f"Part {index}: {summary}" for index, summary in enumerate(summaries, start=1))
+        # summaries of a very long article are reduced group-wise until they fit one call.
+        while self.estimate_tokens(combined) > self.input_budget:
+            reduced = await asyncio.gather(*(
+                self._call_with_retries(system=self.merge_instruction, content=group)
+                for group in self.split(combined)
+            ))
+            results.extend(reduced)
+            previous = combined
+            combined = "\n\n".join(f"Part {index}: {partial['summary']}" for index, partial in enumerate(reduced, start=1))
+            # a model that stops shrinking its summaries would keep this loop calling it forever.
+            if len(combined) >= len(previous):
+                self.logger.warning(f"{NewsExtractor.__name__}: merged summaries stopped shrinking, truncating them to the input budget.")
+                metrics.inc("llm_extraction_merge_truncated")
+                combined = combined[:int(self.input_budget * self.chars_per_token)]
+                break
+        merged = await self._call_with_retries(system=self.merge_instruction, content=combined)
+
+        return {
+            "keywords": self._union([merged["keywords"], *(result["keywords"] for result in results)]),
+            "organizations": self._union([merged["organizations"], *(result["organizations"] for result in results)]),
+            "summary": merged["summary"]
+        }
+
+
+    # extract summary, keywords and organizations; one call when the article fits the context window.
+    async def extract(self, content: str) -> dict:
+        tokens = self.estimate_tokens(content)
+        metrics.observe("extraction_input_tokens", tokens)
+        if tokens <= self.input_budget:
+            return await self._call_with_retries(system=self.instruction, content=content)
+
+        parts = self.split(content)
+        metrics.inc("llm_extraction_split_articles")
+        self.logger.info(f"{NewsExtractor.__name__}: ~{tokens} tokens exceed the {self.input_budget} token budget, extracting {len(parts)} parts.")
+        partials = await asyncio.gather(*(
+            self._call_with_retries(system=self.part_instruction.format(part=index, parts=len(parts)), content=part)
+            for index, part in enumerate(parts, start=1)
+        ))
+
+        return await self._merge(partials=list(partials))
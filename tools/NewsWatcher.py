@@ -0,0 +1,217 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime, date, time, timedelta, timezone
+import asyncio
+import json
+import signal
+import threading
+
+from tools.Metrics import metrics
+
+import os
+
+
+# press releases give their issue time in Hong Kong time.
+HKT = timezone(timedelta(hours=8))
+
+
+def _pid_alive(pid: int | None) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # exists, but belongs to another user.
+        return True
+
+    return True
+
+
+class NewsWatcher:
+    def __init__(self, logger, crawler, article_store):
+        self.logger = logger
+        self.crawler = crawler
+        self.article_store = article_store
+
+        # watch config.
+        self.interval = float(os.getenv("watch_interval", "300"))
+        self.days = int(os.getenv("watch_days", "2"))
+        self.status_path = os.getenv("watch_status_path", "./watch_status.json")
+        self.health_port = int(os.getenv("watch_health_port", "0"))
+        self.health_host = os.getenv("watch_health_host", "127.0.0.1")
+        self.status: dict = {}
+        self.status_lock = threading.Lock()
+        self.server: ThreadingHTTPServer | None = None
+
+        self.logger.info(f"{NewsWatcher.__name__} initiated.")
+
+
+    # ingest lag = time from the press release's issue time (HKT) to its first ingestion (local time).
+    def _ingest_lags(self, since: str) -> list[float]:
+        lags = []
+        for article in self.article_store.first_ingested_since(since):
+            try:
+                published = datetime.combine(
+                    datetime.fromtimestamp(article["pub_date"]).date(),
+                    time.fromisoformat(article["pub_time"]),
+                    tzinfo=HKT
+                )
+            except (TypeError, ValueError):
+                continue
+            lags.append(max(0.0, (datetime.fromisoformat(article["first_ingested_at"]).astimezone() - published).total_seconds()))
+
+        return lags
+
+
+    def _update_status(self, **fields) -> None:
+        with self.status_lock:
+            self.status.update(fields)
+            self.status["updated_at"] = datetime.now().isoformat(timespec="seconds")
+            status = dict(self.status)
+        tmp_path = f"{self.status_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(status, file, indent=2)
+        os.replace(tmp_path, self.status_path)
+
+
+    # health as seen by a probe: stale once two polls in a row have been missed.
+    def health(self) -> dict:
+        with self.status_lock:
+            status = dict(self.status)
+        last_success = status.get("last_success")
+        age = (datetime.now() - datetime.fromisoformat(last_success)).total_seconds() if last_success else None
+        healthy = age is not None and age <= 2 * self.interval + status.get("last_poll_duration_s", 0)
+
+        return {**status, "seconds_since_last_success": age, "healthy": healthy}
+
+
+    # status written by the watch process, readable from any other process (e.g. the chat agent).
+    def read_status(self) -> dict:
+        if not os.path.exists(self.status_path):
+            return {"running": False, "detail": "watch mode has not run yet."}
+        with open(self.status_path, "r", encoding="utf-8") as file:
+            status = json.load(file)
+        if not status.get("running"):
+            return status
+
+        # a killed watcher never writes running=False, so check that it is still alive and polling.
+        if not _pid_alive(status.get("pid")):
+            return {**status, "running": False, "detail": "watch process is no longer running."}
+        heartbeat = status.get("updated_at")
+        age = (datetime.now() - datetime.fromisoformat(heartbeat)).total_seconds() if heartbeat else None
+        if age is None or age > 2 * status.get("interval_s", self.interval) + status.get("last_poll_duration_s", 0):
+            return {**status, "stale": True, "detail": "watch process has not reported within two poll intervals."}
+
+        return {**status, "stale": False}
+
+
+    def _start_health_server(self, port: int) -> None:
+        watcher = self
+
+        class HealthHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                return
+
+            def do_GET(self):
+                if self.path == "/health":
+                    health = watcher.health()
+                    body = json.dumps(health, default=str).encode("utf-8")
+                    self.send_response(200 if health["healthy"] else 503)
+                    self.send_header("Content-Type", "application/json")
+                elif self.path == "/metrics":
+                    body = metrics.to_prometheus().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                else:
+                    body = b"not found"
+                    self.send_response(404)
+                    self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer((self.health_host, port), HealthHandler)
+        threading.Thread(target=self.server.serve_forever, name="watch-health", daemon=True).start()
+        self.logger.info(f"{NewsWatcher.__name__}: health endpoint on http://{self.health_host}:{port}/health and /metrics.")
+
+
+    async def _poll(self) -> None:
+        today = date.today()
+        start = (today - timedelta(days=self.days - 1)).strftime("%Y%m%d")
+        end = today.strftime("%Y%m%d")
+        started = datetime.now()
+        started_at = started.isoformat(timespec="seconds")
+        ingested_before = metrics.snapshot()["counters"].get("articles_ingested", 0)
+        self._update_status(last_poll_started=started_at)
+
+        try:
+            with metrics.span("watch_poll"):
+                await self.crawler.afetch_news_by_dates(startDate=start, endDate=end)
+        except Exception as e:
+            self.logger.error(f"{NewsWatcher.__name__}: poll {start}-{end} failed: {e}")
+            with self.status_lock:
+                poll_errors = self.status.get("poll_errors", 0) + 1
+            self._update_status(poll_errors=poll_errors, last_error=str(e), last_error_at=datetime.now().isoformat(timespec="seconds"))
+            return
+
+        finished = datetime.now()
+        ingested = int(metrics.snapshot()["counters"].get("articles_ingested", 0) - ingested_before)
+        lags = self._ingest_lags(since=started_at)
+        for lag in lags:
+            metrics.observe("ingest_lag_seconds", lag)
+        with self.status_lock:
+            polls = self.status.get("polls", 0) + 1
+            total = self.status.get("articles_ingested", 0) + ingested
+        self._update_status(
+            polls=polls,
+            last_success=finished.isoformat(timespec="seconds"),
+            last_poll_duration_s=round((finished - started).total_seconds(), 2),
+            last_poll_ingested=ingested,
+            articles_ingested=total,
+            last_ingest_lag_max_s=round(max(lags), 1) if lags else None
+        )
+        metrics.export()
+        self.logger.info(f"{NewsWatcher.__name__}: poll {start}-{end} ingested {ingested} press releases.")
+
+
+    # poll today's (and recent days') index pages until interrupted.
+    async def run(self, interval: float | None = None, health_port: int | None = None) -> None:
+        self.interval = interval or self.interval
+        port = self.health_port if health_port is None else health_port
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        if port:
+            self._start_health_server(port=port)
+        self._update_status(
+            running=True,
+            pid=os.getpid(),
+            started_at=datetime.now().isoformat(timespec="seconds"),
+            interval_s=self.interval,
+            days=self.days
+        )
+        self.logger.info(f"{NewsWatcher.__name__}: polling the last {self.days} days every {self.interval:.0f}s.")
+
+        try:
+            while not stop.is_set():
+                await self._poll()
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._update_status(running=False)
+            await self.crawler.http_fetcher.aclose()
+            if self.server is not None:
+                self.server.shutdown()
+            self.logger.info(f"{NewsWatcher.__name__} stopped.")
+
+
+    def watch(self, interval: float | None = None, health_port: int | None = None) -> None:
+        asyncio.run(self.run(interval=interval, health_port=health_port))
@@ -0,0 +1,96 @@
+from pydantic import BaseModel, Field
+
+from tools.DataProcessor import NEWS_URL_PATTERN, news_id_from_url
+
+from datetime import datetime, date, time
+import re
+
+
+# footer patterns of English and Chinese press releases, e.g.
+# "Ends/Friday, August 1, 2026" / "Issued at HKT 16:30" and
+# "完/2026年8月1日（星期五）" / "香港時間16時30分".
+EN_DATE_PATTERN = re.compile(r"Ends/\s*\w+,\s+(?P<date>[A-Z][a-z]+\s+\d{1,2},\s+\d{4})")
+EN_TIME_PATTERN = re.compile(r"Issued at HKT\s+(?P<hour>\d{1,2}):(?P<minute>\d{2})")
+ZH_DATE_PATTERN = re.compile(r"完\s*/?\s*(?P<year>\d{4})年(?P<month>\d{1,2})月(?P<day>\d{1,2})日")
+ZH_TIME_PATTERN = re.compile(r"香港時間\s*(?P<hour>\d{1,2})時(?P<minute>\d{2})分")
+
+# the footer sits in the last few lines, so only the tail of the page is scanned.
+FOOTER_WINDOW = 800
+
+
+class PressReleaseParseError(ValueError):
+    def __init__(self, url: str, field: str, reason: str):
+        self.url = url
+        self.field = field
+        self.reason = reason
+        super().__init__(f"Cannot parse '{field}' of press release {url}: {reason}")
+
+
+class PressRelease(BaseModel):
+    news_id: str = Field(description="press release id, e.g. P2026080100123")
+    url: str = Field(description="press release url")
+    language: str = Field(description="'en' or 'zh' page layout")
+    title: str = Field(description="press release title")
+    pub_date: date = Field(description="publish date")
+    pub_time: time = Field(description="publish time (HKT)")
+    body: str = Field(description="press release text without the footer")
+
+    @property
+    def pub_date_unix(self) -> int:
+        return int(datetime.combine(self.pub_date, time()).timestamp())
+
+
+def _parse_footer(url: str, tail: str) -> tuple[str, date, time, int]:
+    match = EN_DATE_PATTERN.search(tail)
+    if match:
+        try:
+            pub_date = datetime.strptime(" ".join(match.group("date").split()), "%B %d, %Y").date()
+        except ValueError as e:
+            raise PressReleaseParseError(url=url, field="pub_date", reason=str(e)) from e
+        time_match = EN_TIME_PATTERN.search(tail, match.end())
+        language = "en"
+    else:
+        match = ZH_DATE_PATTERN.search(tail)
+        if not match:
+            raise PressReleaseParseError(url=url, field="pub_date", reason="no 'Ends/' or '完/' footer found")
+        try:
+            pub_date = date(int(match.group("year")), int(match.group("month")), int(match.group("day")))
+        except ValueError as e:
+            raise PressReleaseParseError(url=url, field="pub_date", reason=str(e)) from e
+        time_match = ZH_TIME_PATTERN.search(tail, match.end())
+        language = "zh"
+
+    if not time_match:
+        raise PressReleaseParseError(url=url, field="pub_time", reason="no issue time found after the footer date")
+    try:
+        pub_time = time(int(time_match.group("hour")), int(time_match.group("minute")))
+    except ValueError as e:
+        raise PressReleaseParseError(url=url, field="pub_time", reason=str(e)) from e
+
+    return language, pub_date, pub_time, match.start()
+
+
+# parse a crawled press release page once into a typed record.
+def parse_press_release(url: str, title: str | None, markdown: str | None) -> PressRelease:
+    if not NEWS_URL_PATTERN.search(url):
+        raise PressReleaseParseError(url=url, field="news_id", reason="url is not a press release page")
+    if not markdown or not markdown.strip():
+        raise PressReleaseParseError(url=url, field="body", reason="page has no content")
+
+    offset = max(0, len(markdown) - FOOTER_WINDOW)
+    language, pub_date, pub_time, footer_start = _parse_footer(url=url, tail=markdown[offset:])
+    body = markdown[:offset + footer_start].strip()
+    if not body:
+        raise PressReleaseParseError(url=url, field="body", reason="page has no text before the footer")
+
+    title = (title or "").strip() or body.split("\n", 1)[0].strip("# ").strip()
+
+    return PressRelease(
+        news_id=news_id_from_url(url),
+        url=url,
+        language=language,
+        title=title,
+        pub_date=pub_date,
+        pub_time=pub_time,
+        body=body
+    )
@@ -0,0 +1,171 @@
+from ollama import Client
+from pydantic import BaseModel, Field
+
+from datetime import date, datetime
+from typing import Callable, List, Literal
+import json
+
+from tools.Metrics import metrics
+
+import os
+
+
+class Instruction(BaseModel):
+    intent: Literal["list", "search", "count", "open"] = Field(description="'list' to list press releases by dates and/or organization, 'search' to find press releases about a topic, 'count' for how many press releases (per organization or topic) or how their number changes over time, 'open' for anything else (comparisons, opinions, follow-ups, multi-step analysis)")
+    start_date: date | None = Field(description="start date in the query, null if the query has no dates")
+    end_date: date | None = Field(description="end date in the query, null if the query has no dates")
+    topic: str | None = Field(description="topic specified in the query, null if no topic specified")
+    organizations: List[str] | None = Field(description="subject organizations concerned in the query, null if no organization specified")
+    group_by: Literal["organization", "keyword", "all"] | None = Field(description="for 'count' queries: 'organization' to count per organization, 'keyword' to count per topic, 'all' for a single total; null otherwise")
+    interval: Literal["day", "week", "month"] | None = Field(description="for 'count' queries asking for a trend over time: the time bucket, null otherwise")
+    action: str = Field(description="summarize all the actions in the query")
+
+
+class QueryPlanner:
+    def __init__(self, logger, crawler, db_handler, retriever, rollup_store):
+        self.logger = logger
+        self.crawler = crawler
+        self.db_handler = db_handler
+        self.retriever = retriever
+        self.rollup_store = rollup_store
+
+        # planner config.
+        self.model_name = os.getenv("ollama_llm_model")
+        self.client = Client(host=os.getenv("ollama_base_url", "http://localhost:11434"))
+        self.max_range_days = int(os.getenv("planner_max_range_days", "31"))
+        self.search_k = int(os.getenv("planner_search_k", "10"))
+        self.prompt = (
+            "Extract the items from the query. Only use the information from the query. "
+            "Resolve relative dates (e.g. 'this week', 'yesterday') against today's date, {today} ({weekday})."
+        )
+
+        self.logger.info(f"{QueryPlanner.__name__} initiated.")
+
+
+    # one structured call turns the question into an Instruction.
+    def plan(self, query: str) -> Instruction:
+        today = date.today()
+        with metrics.span("planner_llm"):
+            response = self.client.chat(
+                model=self.model_name,
+                messages=[
+                    {"role": "system", "content": self.prompt.format(today=today.isoformat(), weekday=today.strftime("%A"))},
+                    {"role": "user", "content": query}
+                ],
+                format=Instruction.model_json_schema(),
+                options={"temperature": 0}
+            )
+        instruction = Instruction.model_validate_json(response.message.content)
+        self.logger.info("%s: plan %s", QueryPlanner.__name__, instruction.model_dump_json())
+
+        return instruction
+
+
+    # pick the retrieval tool and one input per organization for a plan; None when the plan needs the agent.
+    def _route(self, instruction: Instruction) -> tuple[str, Callable, list[dict]] | None:
+        if instruction.intent == "open":
+            return None
+        # each organization is looked up on its own, a joined "A B" keyword would match neither.
+        keywords = [instruction.topic] if instruction.topic else instruction.organizations or []
+        dates = {}
+        if instruction.start_date:
+            end = instruction.end_date or instruction.start_date
+            if end < instruction.start_date:
+                return None
+            dates = {"start_date": instruction.start_date.strftime("%B %d, %Y"), "end_date": end.strftime("%B %d, %Y")}
+
+        # counts come from the rollup tables, so any range is cheap.
+        if instruction.intent == "count":
+            # a named organization or topic narrows the groups to the matching ones.
+            if instruction.organizations:
+                group_by, names = "organization", instruction.organizations
+            elif instruction.topic:
+                group_by, names = "keyword", [instruction.topic]
+            else:
+                group_by, names = instruction.group_by or "all", [None]
+            return "aggregate_records", self.rollup_store.aggregate_records, [
+                {**dates, "group_by": group_by, "name": name, "interval": instruction.interval} for name in names
+            ]
+        if dates and not self._within_crawl_range(instruction):
+            return None
+
+        if instruction.intent == "search" and keywords:
+            return "search_records_hybrid", self.retriever.search_records_hybrid, [{"keyword": keyword, **dates, "k": self.search_k} for keyword in keywords]
+        if keywords and dates:
+            return "check_records_by_keyword_dates", self.db_handler.check_records_by_keyword_and_dates, [{"keyword": keyword, **dates} for keyword in keywords]
+        if keywords:
+            return "check_records_by_keyword", self.db_handler.check_records_by_keyword, [{"keyword": keyword} for keyword in keywords]
+        if dates:
+            return "check_records_by_dates", self.db_handler.check_records_by_dates, [dates]
+
+        return None
+
+
+    def _within_crawl_range(self, instruction: Instruction) -> bool:
+        end = instruction.end_date or instruction.start_date
+        return (end - instruction.start_date).days <= self.max_range_days
+
+
+    # unix range of the plan's dates, for response cache invalidation.
+    def date_range(self, instruction: Instruction) -> tuple[int | None, int | None]:
+        if not instruction.start_date:
+            return None, None
+        end = instruction.end_date or instruction.start_date
+
+        return (
+            int(datetime.combine(instruction.start_date, datetime.min.time()).timestamp()),
+            int(datetime.combine(end, datetime.min.time()).timestamp()) + 86399
+        )
+
+
+    # plan, crawl days never fetched, then retrieve; None sends the query to the agent.
+    def try_answer(self, query: str) -> tuple[dict, tuple[int | None, int | None]] | None:
+        try:
+            instruction = self.plan(query=query)
+        except Exception as e:
+            self.logger.warning(f"{QueryPlanner.__name__}: planning failed, falling back to the agent: {e}")
+            metrics.inc("planner_fallbacks")
+            return None
+        route = self._route(instruction=instruction)
+        if route is None:
+            self.logger.info(f"{QueryPlanner.__name__}: '{instruction.intent}' query left to the agent.")
+            metrics.inc("planner_fallbacks")
+            return None
+        name, func, tool_inputs = route
+
+        steps = []
+        # counts are answered from the rollups of what is stored; they never crawl.
+        if instruction.intent != "count" and instruction.start_date and self._within_crawl_range(instruction):
+            crawl_input = {
+                "startDate": instruction.start_date.strftime("%Y%m%d"),
+                "endDate": (instruction.end_date or instruction.start_date).strftime("%Y%m%d")
+            }
+            try:
+                crawled = self.crawler.fetch_missing_dates(**crawl_input)
+            except Exception as e:
+                # answer from what is stored rather than failing the question.
+                self.logger.error(f"{QueryPlanner.__name__}: crawl of missing dates failed: {e}")
+                crawled = f"crawl failed: {e}"
+            steps.append({"tool": "fetch_missing_dates", "tool_input": crawl_input, "observation": crawled})
+        totals = []
+        for tool_input in tool_inputs:
+            try:
+                with metrics.span(f"tool_{name}"):
+                    observation = func(**tool_input)
+            except Exception as e:
+                # e.g. an unreachable embedding model; the agent may still answer with other tools.
+                self.logger.warning(f"{QueryPlanner.__name__}: {name} failed, falling back to the agent: {e}")
+                metrics.inc("planner_fallbacks")
+                return None
+            steps.append({"tool": name, "tool_input": tool_input, "observation": observation})
+            totals.append(observation.get("total", len(observation.get("ids", []))))
+        metrics.inc("planner_answers")
+
+        subjects = [tool_input.get("keyword") or tool_input.get("name") for tool_input in tool_inputs]
+        counts = ", ".join(f"{total} results for '{subject}'" for total, subject in zip(totals, subjects)) if len(tool_inputs) > 1 else f"{totals[0]} results"
+        result = {
+            "output": f"{name} returned {counts} for: {instruction.action}",
+            "intermediate_steps": json.dumps({"plan": instruction.model_dump(mode="json"), "steps": steps}, ensure_ascii=False, indent=2, default=str)
+        }
+
+        return result, self.date_range(instruction=instruction)
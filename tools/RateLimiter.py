@@ -0,0 +1,110 @@
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+import asyncio
+import time
+
+from tools.Metrics import metrics
+
+import os
+
+
+# status codes that mean the remote site wants us to slow down.
+THROTTLE_STATUS = {429, 503}
+
+
+class HostState:
+    def __init__(self, host: str, concurrency: float):
+        self.host = host
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self.latency_ewma: float | None = None
+        self.latency_floor: float | None = None
+        self.loop = None
+        self.condition: asyncio.Condition | None = None
+
+
+class FetchSlot:
+    def __init__(self):
+        self.status_code: int | None = None
+        self.ok = True
+
+    def report(self, ok: bool, status_code: int | None = None) -> None:
+        self.ok = ok
+        self.status_code = status_code
+
+
+class AdaptiveRateLimiter:
+    def __init__(self, logger):
+        self.logger = logger
+
+        # limiter config.
+        self.min_concurrency = int(os.getenv("rate_min_concurrency", "1"))
+        self.max_concurrency = int(os.getenv("rate_max_concurrency", "8"))
+        self.initial_concurrency = int(os.getenv("rate_initial_concurrency", "3"))
+        self.latency_factor = float(os.getenv("rate_latency_factor", "2.0"))
+        self.hosts: dict[str, HostState] = {}
+
+        self.logger.info(f"{AdaptiveRateLimiter.__name__} initiated.")
+
+
+    def _state(self, url: str) -> HostState:
+        host = urlparse(url).netloc
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = HostState(host=host, concurrency=float(self.initial_concurrency))
+        # the condition belongs to the running event loop; learned limits carry over between runs.
+        loop = asyncio.get_running_loop()
+        if state.loop is not loop:
+            state.loop = loop
+            state.condition = asyncio.Condition()
+            state.in_flight = 0
+
+        return state
+
+
+    # additive increase while latency is healthy, multiplicative decrease on errors, throttling or slowdowns.
+    def _adapt(self, state: HostState, latency: float, slot: FetchSlot) -> None:
+        alpha = 0.2
+        state.latency_ewma = latency if state.latency_ewma is None else alpha * latency + (1 - alpha) * state.latency_ewma
+        state.latency_floor = state.latency_ewma if state.latency_floor is None else min(state.latency_floor, state.latency_ewma)
+
+        throttled = slot.status_code in THROTTLE_STATUS
+        slow = state.latency_ewma > self.latency_factor * state.latency_floor
+        previous = int(state.concurrency)
+        if throttled or not slot.ok or slow:
+            state.concurrency = max(float(self.min_concurrency), state.concurrency / 2)
+        else:
+            state.concurrency = min(float(self.max_concurrency), state.concurrency + 1 / state.concurrency)
+
+        if int(state.concurrency) != previous:
+            # backing off is worth seeing at INFO; ramping up is routine.
+            log = self.logger.info if int(state.concurrency) < previous else self.logger.debug
+            log(
+                "%s: %s concurrency %d -> %d (latency %.2fs, floor %.2fs, ok=%s, status=%s).",
+                AdaptiveRateLimiter.__name__, state.host, previous, int(state.concurrency),
+                state.latency_ewma, state.latency_floor, slot.ok, slot.status_code
+            )
+        metrics.observe("host_latency_seconds", latency)
+        if throttled:
+            metrics.inc("host_throttled")
+
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        state = self._state(url=url)
+        async with state.condition:
+            await state.condition.wait_for(lambda: state.in_flight < int(state.concurrency))
+            state.in_flight += 1
+
+        fetch_slot = FetchSlot()
+        start = time.perf_counter()
+        try:
+            yield fetch_slot
+        except Exception:
+            fetch_slot.report(ok=False)
+            raise
+        finally:
+            self._adapt(state=state, latency=time.perf_counter() - start, slot=fetch_slot)
+            async with state.condition:
+                state.in_flight -= 1
+                state.condition.notify_all()
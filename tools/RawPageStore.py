@@ -0,0 +1,123 @@
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from typing import Iterator
+
+from tools.DataProcessor import page_date_from_url
+
+import os
+
+
+class RawPageStore:
+    def __init__(self, logger):
+        self.logger = logger
+
+        # raw page store config.
+        self.store_path = os.getenv("raw_page_store_path", "./raw_pages.db")
+        self.compression_level = int(os.getenv("raw_page_compression_level", "6"))
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.store_path, check_same_thread=False)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS raw_pages (
+                url TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                page_date TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                content BLOB NOT NULL,
+                fetched_at TEXT NOT NULL,
+                checked_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_raw_pages_kind_date ON raw_pages (kind, page_date);
+            """
+        )
+        self.conn.commit()
+        self.logger.info(f"{RawPageStore.__name__} initiated.")
+
+
+    def get(self, url: str) -> dict | None:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT url, kind, etag, last_modified, content, fetched_at FROM raw_pages WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        return {
+            "url": row[0],
+            "kind": row[1],
+            "etag": row[2],
+            "last_modified": row[3],
+            "content": zlib.decompress(row[4]),
+            "fetched_at": row[5]
+        }
+
+
+    # validators only, so a conditional request does not decompress the stored page.
+    def get_validators(self, url: str) -> tuple[str | None, str | None] | None:
+        with self.lock:
+            row = self.conn.execute("SELECT etag, last_modified FROM raw_pages WHERE url = ?", (url,)).fetchone()
+
+        return tuple(row) if row else None
+
+
+    def put(self, url: str, kind: str, content: bytes | str, etag: str | None = None, last_modified: str | None = None) -> None:
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        now = datetime.now().isoformat(timespec="seconds")
+        compressed = zlib.compress(content, self.compression_level)
+        with self.lock:
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO raw_pages (url, kind, page_date, etag, last_modified, content, fetched_at, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (url, kind, page_date_from_url(url), etag, last_modified, compressed, now, now)
+            )
+            self.conn.commit()
+        self.logger.debug("%s: stored %s (%d -> %d bytes).", RawPageStore.__name__, url, len(content), len(compressed))
+
+        return
+
+
+    # a 304 revalidated the stored copy.
+    def touch(self, url: str) -> None:
+        with self.lock:
+            self.conn.execute("UPDATE raw_pages SET checked_at = ? WHERE url = ?", (datetime.now().isoformat(timespec="seconds"), url))
+            self.conn.commit()
+
+        return
+
+
+    def count(self, kind: str | None = None) -> int:
+        with self.lock:
+            if kind is None:
+                return self.conn.execute("SELECT COUNT(*) FROM raw_pages").fetchone()[0]
+            return self.conn.execute("SELECT COUNT(*) FROM raw_pages WHERE kind = ?", (kind,)).fetchone()[0]
+
+
+    # stored pages of one kind between two YYYYMMDD dates, read in batches so the archive is never loaded at once.
+    def iter_pages(self, kind: str, start_date: str | None = None, end_date: str | None = None, batch_size: int = 200) -> Iterator[tuple[str, bytes]]:
+        conditions, params = ["kind = ?"], [kind]
+        if start_date:
+            conditions.append("page_date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("page_date <= ?")
+            params.append(end_date)
+
+        last_url = ""
+        while True:
+            with self.lock:
+                rows = self.conn.execute(
+                    f"SELECT url, content FROM raw_pages WHERE {' AND '.join(conditions)} AND url > ? ORDER BY url LIMIT ?",
+                    (*params, last_url, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for url, content in rows:
+                yield url, zlib.decompress(content)
+            last_url = rows[-1][0]
@@ -0,0 +1,238 @@
+from ollama import AsyncClient
+
+from collections import defaultdict
+from datetime import datetime
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+
+from tools.DataProcessor import date_to_unix
+from tools.Metrics import metrics
+from tools.writeReport import write_report
+
+import os
+
+
+GROUP_PROMPT = (
+    "You are an expert analyst. The following are summaries of Hong Kong Government press releases about {group}. "
+    "Write a concise analytical summary of them, highlighting key announcements, themes, trends and implications. "
+    "Maximum 500 words. Only use the information in the summaries."
+)
+PATTERN_PROMPT = (
+    "You are an expert analyst. The following are grouped summaries of Hong Kong Government press releases. "
+    "Write two short markdown lists under the headings '## Cross-Group Patterns' and '## Suggested Follow-Ups': "
+    "notable patterns across all groups, and potential follow-up questions or analyses."
+)
+# bump when the prompts change so cached group summaries are not reused.
+PROMPT_VERSION = "1"
+OTHER_GROUP = "Other"
+
+
+class ReportEngine:
+    def __init__(self, logger, article_store):
+        self.logger = logger
+        self.article_store = article_store
+
+        # llm config.
+        self.model_name = os.getenv("ollama_llm_model")
+        self.host = os.getenv("ollama_base_url", "http://localhost:11434")
+        self.options = {"temperature": 0.2, "num_predict": 1000}
+
+        # report config.
+        self.workers = int(os.getenv("report_workers", "2"))
+        self.batch_size = int(os.getenv("report_batch_size", "20"))
+        # every reduce level must merge at least two texts, or _reduce never converges.
+        if self.batch_size < 2:
+            raise ValueError(f"report_batch_size must be at least 2, got {self.batch_size}.")
+        self.min_group_size = int(os.getenv("report_min_group_size", "2"))
+        self.max_groups = int(os.getenv("report_max_groups", "12"))
+        self._loop = None
+
+        # group summary cache config.
+        self.cache_path = os.getenv("report_cache_path", "./report_cache.db")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS group_summaries (
+                cache_key TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+        self.logger.info(f"{ReportEngine.__name__} initiated with model={self.model_name}, workers={self.workers}.")
+
+
+    # async client and worker pool are bound to the running event loop.
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self.client = AsyncClient(host=self.host)
+            self.semaphore = asyncio.Semaphore(self.workers)
+
+
+    # group summary cache, keyed by the prompt, the group and its exact article set.
+    def _cache_key(self, kind: str, group: str, parts: list[str]) -> str:
+        payload = json.dumps([PROMPT_VERSION, self.model_name, kind, group, sorted(parts)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+    def _cache_get(self, cache_key: str) -> str | None:
+        with self.lock:
+            row = self.conn.execute("SELECT summary FROM group_summaries WHERE cache_key = ?", (cache_key,)).fetchone()
+
+        return row[0] if row else None
+
+
+    def _cache_put(self, cache_key: str, summary: str) -> None:
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO group_summaries (cache_key, summary, created_at) VALUES (?, ?, ?)",
+                (cache_key, summary, datetime.now().isoformat(timespec="seconds"))
+            )
+            self.conn.commit()
+
+        return
+
+
+    async def _call_model(self, system: str, content: str) -> str:
+        self._bind_loop()
+        async with self.semaphore:
+            with metrics.span("report_llm"):
+                response = await self.client.chat(
+                    model=self.model_name,
+                    messages=[
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": content}
+                    ],
+                    options=self.options
+                )
+        metrics.inc("report_llm_calls")
+
+        return response.message.content
+
+
+    async def _cached_call(self, kind: str, group: str, parts: list[str], system: str, content: str) -> str:
+        cache_key = self._cache_key(kind=kind, group=group, parts=parts)
+        cached = await asyncio.to_thread(self._cache_get, cache_key)
+        if cached is not None:
+            metrics.inc("report_cache_hits")
+            return cached
+        summary = await self._call_model(system=system, content=content)
+        await asyncio.to_thread(self._cache_put, cache_key, summary)
+
+        return summary
+
+
+    # map output is the stored per-article summary; no raw chunk is summarised again.
+    @staticmethod
+    def _article_text(article: dict) -> str:
+        return f"- {article.get('title')} ({article.get('url')}):\n{article.get('summary') or ''}"
+
+
+    # reduce a group; groups larger than one batch are reduced batch-wise, then reduced again.
+    async def _reduce(self, group: str, texts: list[tuple[str, str]]) -> str:
+        system = GROUP_PROMPT.format(group=group)
+        if len(texts) <= self.batch_size:
+            return await self._cached_call(
+                kind="group",
+                group=group,
+                parts=[key for key, _ in texts],
+                system=system,
+                content="\n\n".join(text for _, text in texts)
+            )
+
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        partials = await asyncio.gather(*(self._reduce(group=group, texts=batch) for batch in batches))
+        keys = [hashlib.sha256(partial.encode("utf-8")).hexdigest() for partial in partials]
+
+        return await self._reduce(group=group, texts=list(zip(keys, partials)))
+
+
+    # first listed organization (or keyword) of each article; small groups are folded into "Other".
+    def _group(self, articles: list[dict], group_by: str) -> dict[str, list[dict]]:
+        field = "organizations" if group_by == "organization" else "keywords"
+        groups: dict[str, list[dict]] = defaultdict(list)
+        names: dict[str, str] = {}
+        for article in articles:
+            values = article.get(field) or []
+            name = values[0].strip() if values and values[0].strip() else OTHER_GROUP
+            key = name.casefold()
+            names.setdefault(key, name)
+            groups[key].append(article)
+
+        ranked = sorted((key for key in groups if names[key] != OTHER_GROUP), key=lambda key: -len(groups[key]))
+        kept = [key for key in ranked if len(groups[key]) >= self.min_group_size][:self.max_groups]
+        result = {names[key]: groups[key] for key in kept}
+        other = [article for key in groups if key not in kept for article in groups[key]]
+        if other:
+            result[OTHER_GROUP] = other
+
+        return result
+
+
+    def _render(self, start_date: str, end_date: str, group_by: str, groups: dict[str, list[dict]], summaries: dict[str, str], patterns: str) -> str:
+        total = sum(len(articles) for articles in groups.values())
+        lines = [
+            f"# Media Summary Report: {start_date} - {end_date}",
+            "",
+            f"{total} press releases in {len(groups)} groups by {group_by}.",
+            "",
+            "## Grouped Summaries",
+            ""
+        ]
+        for group, articles in groups.items():
+            lines += [f"### {group} ({len(articles)})", "", summaries[group].strip(), ""]
+            lines += [f"- [{article.get('title')}]({article.get('url')})" for article in articles]
+            lines.append("")
+        lines.append(patterns.strip())
+
+        return "\n".join(lines)
+
+
+    async def arun(self, start_date: str, end_date: str, group_by: str = "organization") -> dict:
+        with metrics.span("report_collect"):
+            news_ids = self.article_store.search_news_ids(start_unix=date_to_unix(start_date), end_unix=date_to_unix(end_date))
+            articles = [article for article in self.article_store.get_articles(news_ids=news_ids).values() if article.get("summary")]
+        if not articles:
+            return {"report_file": None, "articles": 0, "groups": 0, "detail": f"no summarised press releases between {start_date} and {end_date}."}
+
+        groups = self._group(articles=articles, group_by=group_by)
+        calls_before = metrics.snapshot()["counters"].get("report_llm_calls", 0)
+
+        # every group is reduced concurrently; the semaphore bounds the ollama load.
+        reduced = await asyncio.gather(*(
+            self._reduce(
+                group=group,
+                texts=[(f"{article['news_id']}@{article.get('ingested_at')}", self._article_text(article)) for article in group_articles]
+            )
+            for group, group_articles in groups.items()
+        ))
+        summaries = dict(zip(groups, reduced))
+        patterns = await self._cached_call(
+            kind="patterns",
+            group="*",
+            parts=[hashlib.sha256(f"{group}\n{summary}".encode("utf-8")).hexdigest() for group, summary in summaries.items()],
+            system=PATTERN_PROMPT,
+            content="\n\n".join(f"### {group}\n{summary}" for group, summary in summaries.items())
+        )
+
+        markdown = self._render(start_date=start_date, end_date=end_date, group_by=group_by, groups=groups, summaries=summaries, patterns=patterns)
+        report_file = await asyncio.to_thread(write_report, markdown)
+        llm_calls = int(metrics.snapshot()["counters"].get("report_llm_calls", 0) - calls_before)
+        self.logger.info(f"{ReportEngine.__name__}: {report_file} from {len(articles)} press releases in {len(groups)} groups, {llm_calls} llm calls.")
+
+        return {"report_file": report_file, "articles": len(articles), "groups": len(groups), "llm_calls": llm_calls}
+
+
+    def generate_report(self, start_date: str, end_date: str, group_by: str = "organization") -> dict:
+        if group_by not in ("organization", "topic"):
+            raise ValueError(f"Unsupported group_by '{group_by}', expected 'organization' or 'topic'.")
+        with metrics.span("generate_report"):
+            return asyncio.run(self.arun(start_date=start_date, end_date=end_date, group_by=group_by))
@@ -0,0 +1,230 @@
+import numpy as np
+import sqlite3
+import threading
+import json
+import re
+from datetime import datetime, date
+
+from tools.DataProcessor import date_to_unix
+from tools.Metrics import metrics
+
+import os
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", query.lower()).split())
+
+
+MONTHS = {
+    "january", "february", "march", "april", "may", "june", "july", "august", "september", "october", "november", "december",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec"
+}
+TEMPORAL_WORDS = {
+    "today", "yesterday", "tomorrow", "tonight", "day", "days", "week", "weeks", "weekend", "month", "months", "year", "years",
+    "last", "this", "next", "past", "previous", "recent", "latest", "ago", "daily", "weekly", "monthly", "morning", "afternoon", "evening"
+}
+STOPWORDS = {
+    "a", "an", "the", "of", "in", "on", "at", "to", "for", "from", "by", "with", "about", "and", "or", "any", "all", "me", "my",
+    "i", "we", "you", "it", "its", "their", "there", "that", "these", "those", "what", "which", "who", "whom", "how", "when",
+    "where", "why", "did", "do", "does", "is", "are", "was", "were", "be", "been", "has", "have", "had", "can", "could", "would",
+    "will", "should", "please", "list", "show", "give", "tell", "find", "get", "summarise", "summarize", "many", "much"
+}
+
+
+# what a semantic match must agree on exactly: named entities, numbers and time references.
+# embeddings of "Labour Department last week" and "Health Department last month" are close, the answers are not.
+def query_signature(query: str) -> str:
+    words = re.findall(r"\w+", query)
+    terms = {word for word in (word.lower() for word in words) if word.isdigit() or word in MONTHS or word in TEMPORAL_WORDS}
+    entities = {word.lower() for word in words if word[0].isupper() and word.lower() not in STOPWORDS | MONTHS | TEMPORAL_WORDS}
+    # an all-lowercase query has no capitalised entities, so every content word has to agree.
+    if not entities:
+        entities = {word for word in (word.lower() for word in words) if word not in STOPWORDS and word not in terms}
+
+    return " ".join(sorted(terms | entities))
+
+
+def _to_unix(value: str) -> int | None:
+    for parse in (date_to_unix, lambda text: int(datetime.strptime(text, "%Y%m%d").timestamp())):
+        try:
+            return parse(value)
+        except (TypeError, ValueError):
+            continue
+
+    return None
+
+
+# the date range an agent run looked at, from the dates passed to its tools; None means unbounded.
+def date_range_from_steps(steps: list) -> tuple[int | None, int | None]:
+    starts, ends, unbounded = [], [], False
+    for action, _ in steps:
+        tool_input = getattr(action, "tool_input", None)
+        if not isinstance(tool_input, dict):
+            continue
+        start = tool_input.get("start_date") or tool_input.get("startDate")
+        end = tool_input.get("end_date") or tool_input.get("endDate")
+        start_unix, end_unix = _to_unix(start) if start else None, _to_unix(end) if end else None
+        if start_unix is None or end_unix is None:
+            unbounded = True
+            continue
+        starts.append(start_unix)
+        ends.append(end_unix + 86399)
+    if unbounded or not starts:
+        return None, None
+
+    return min(starts), max(ends)
+
+
+class ResponseCache:
+    def __init__(self, logger, embedding_function, article_store):
+        self.logger = logger
+        self.embedding_function = embedding_function
+        self.article_store = article_store
+
+        # response cache config.
+        self.cache_path = os.getenv("response_cache_path", "./response_cache.db")
+        self.similarity = float(os.getenv("response_cache_similarity", "0.95"))
+        self.ttl = float(os.getenv("response_cache_ttl", "21600"))
+        self.max_entries = int(os.getenv("response_cache_max_entries", "500"))
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS response_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                query TEXT NOT NULL,
+                normalized_query TEXT NOT NULL,
+                embedding BLOB,
+                response TEXT NOT NULL,
+                start_unix INTEGER,
+                end_unix INTEGER,
+                watermark TEXT,
+                created_at REAL NOT NULL,
+                created_on TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_query ON response_cache (normalized_query)")
+        # entries cached before signatures existed have none and are only served on exact matches.
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(response_cache)")}
+        if "signature" not in columns:
+            self.conn.execute("ALTER TABLE response_cache ADD COLUMN signature TEXT")
+        self.conn.commit()
+        self.logger.info(f"{ResponseCache.__name__} initiated.")
+
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embedding_function([text])[0], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+
+        return vector / norm if norm else vector
+
+
+    # an entry is still valid if it is from today, within ttl, and nothing was ingested for its date range since.
+    def _is_fresh(self, row: tuple) -> bool:
+        _, _, start_unix, end_unix, watermark, created_at, created_on = row
+        if created_on != date.today().isoformat() or datetime.now().timestamp() - created_at > self.ttl:
+            return False
+
+        return self.article_store.max_ingested_at(start_unix=start_unix, end_unix=end_unix) == watermark
+
+
+    def _candidates(self, normalized: str | None = None, signature: str | None = None) -> list[tuple]:
+        with self.lock:
+            if normalized is not None:
+                return self.conn.execute(
+                    "SELECT id, response, start_unix, end_unix, watermark, created_at, created_on FROM response_cache WHERE normalized_query = ? ORDER BY created_at DESC",
+                    (normalized,)
+                ).fetchall()
+            return self.conn.execute(
+                "SELECT id, response, start_unix, end_unix, watermark, created_at, created_on, embedding FROM response_cache WHERE created_on = ? AND signature = ? AND embedding IS NOT NULL",
+                (date.today().isoformat(), signature)
+            ).fetchall()
+
+
+    def _hit(self, entry_id: int, response: str, kind: str) -> dict:
+        with self.lock:
+            self.conn.execute("UPDATE response_cache SET last_used = ? WHERE id = ?", (datetime.now().timestamp(), entry_id))
+            self.conn.commit()
+        metrics.inc(f"response_cache_hits_{kind}")
+        self.logger.info("%s: %s hit for cached response %d.", ResponseCache.__name__, kind, entry_id)
+
+        return json.loads(response)
+
+
+    def _drop(self, entry_ids: list[int]) -> None:
+        if not entry_ids:
+            return
+        with self.lock:
+            self.conn.executemany("DELETE FROM response_cache WHERE id = ?", [(entry_id,) for entry_id in entry_ids])
+            self.conn.commit()
+        metrics.inc("response_cache_invalidated", len(entry_ids))
+
+        return
+
+
+    # exact match on the normalised text first, then the most similar query embedding of today with the same signature.
+    def lookup(self, query: str) -> dict | None:
+        with metrics.span("response_cache_lookup"):
+            normalized = normalize_query(query)
+            stale = []
+            for row in self._candidates(normalized=normalized):
+                if self._is_fresh(row):
+                    self._drop(stale)
+                    return self._hit(entry_id=row[0], response=row[1], kind="exact")
+                stale.append(row[0])
+
+            rows = [row for row in self._candidates(signature=query_signature(query)) if row[0] not in stale]
+            vector = None
+            if rows:
+                try:
+                    vector = self._embed(normalized)
+                except Exception as e:
+                    # an unreachable embedding model makes this a miss, not a failed question.
+                    self.logger.warning(f"{ResponseCache.__name__}: cannot embed query for semantic matching: {e}")
+                    metrics.inc("response_cache_embed_failures")
+            if vector is not None:
+                matrix = np.stack([np.frombuffer(row[7], dtype=np.float32) for row in rows])
+                scores = matrix @ vector
+                for index in np.argsort(-scores):
+                    if scores[index] < self.similarity:
+                        break
+                    if self._is_fresh(rows[index][:7]):
+                        self._drop(stale)
+                        return self._hit(entry_id=rows[index][0], response=rows[index][1], kind="semantic")
+                    stale.append(rows[index][0])
+            self._drop(stale)
+
+        metrics.inc("response_cache_misses")
+
+        return None
+
+
+    def store(self, query: str, response: dict, start_unix: int | None = None, end_unix: int | None = None) -> None:
+        normalized = normalize_query(query)
+        try:
+            embedding = self._embed(normalized).tobytes()
+        except Exception as e:
+            # exact matches still work without an embedding.
+            self.logger.warning(f"{ResponseCache.__name__}: cannot embed query for semantic matching: {e}")
+            embedding = None
+        now = datetime.now().timestamp()
+        watermark = self.article_store.max_ingested_at(start_unix=start_unix, end_unix=end_unix)
+        with self.lock:
+            self.conn.execute(
+                """
+                INSERT INTO response_cache (query, normalized_query, signature, embedding, response, start_unix, end_unix, watermark, created_at, created_on, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (query, normalized, query_signature(query), embedding, json.dumps(response, ensure_ascii=False), start_unix, end_unix, watermark, now, date.today().isoformat(), now)
+            )
+            # keep the most recently used entries.
+            self.conn.execute(
+                "DELETE FROM response_cache WHERE id NOT IN (SELECT id FROM response_cache ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self.conn.commit()
+        self.logger.debug("%s: cached response for '%s' (range %s-%s).", ResponseCache.__name__, normalized, start_unix, end_unix)
+
+        return
@@ -0,0 +1,214 @@
+import sqlite3
+import threading
+from collections import defaultdict
+from datetime import datetime, date, timedelta
+
+from tools.DataProcessor import date_to_unix
+
+import os
+
+
+# rollup dimensions; "all" has the single value "*" and counts every press release of the day.
+DIMENSIONS = {"organization": "organizations", "keyword": "keywords", "all": None}
+INTERVALS = ["day", "week", "month"]
+
+
+def _value_key(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+
+def _period(day: str, interval: str) -> str:
+    if interval == "day":
+        return day
+    if interval == "month":
+        return day[:7]
+    start = date.fromisoformat(day)
+
+    return (start - timedelta(days=start.weekday())).isoformat()
+
+
+class RollupStore:
+    def __init__(self, logger, article_store):
+        self.logger = logger
+        self.article_store = article_store
+
+        # rollup store config.
+        self.store_path = os.getenv("rollup_store_path", "./rollups.db")
+        self.max_ids = int(os.getenv("rollup_max_ids", "50"))
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.store_path, check_same_thread=False)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS rollup_counts (
+                dimension TEXT NOT NULL,
+                value_key TEXT NOT NULL,
+                day TEXT NOT NULL,
+                value TEXT NOT NULL,
+                article_count INTEGER NOT NULL,
+                PRIMARY KEY (dimension, value_key, day)
+            );
+            CREATE INDEX IF NOT EXISTS idx_rollup_counts_day ON rollup_counts (dimension, day);
+            CREATE TABLE IF NOT EXISTS rollup_members (
+                dimension TEXT NOT NULL,
+                value_key TEXT NOT NULL,
+                day TEXT NOT NULL,
+                news_id TEXT NOT NULL,
+                PRIMARY KEY (dimension, value_key, day, news_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_rollup_members_news_id ON rollup_members (news_id);
+            """
+        )
+        self.conn.commit()
+
+        # backfill the rollups for articles stored before they existed.
+        if self.count() == 0 and self.article_store.count() > 0:
+            self.rebuild()
+
+        self.logger.info(f"{RollupStore.__name__} initiated.")
+
+
+    def count(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM rollup_members WHERE dimension = 'all'").fetchone()[0]
+
+
+    # (dimension, value_key) -> display value of the rollup rows an article belongs to.
+    def _memberships(self, article: dict) -> tuple[str | None, dict[tuple[str, str], str]]:
+        if article.get("pub_date") is None:
+            return None, {}
+        day = datetime.fromtimestamp(article["pub_date"]).date().isoformat()
+        memberships = {("all", "*"): "*"}
+        for dimension, field in DIMENSIONS.items():
+            for value in (article.get(field) or []) if field else []:
+                key = _value_key(value)
+                if key:
+                    memberships.setdefault((dimension, key), " ".join(value.split()))
+
+        return day, memberships
+
+
+    # incremental update: only the rows an upserted article joins or leaves are touched.
+    def apply(self, articles: list[dict]) -> None:
+        if not articles:
+            return
+        with self.lock:
+            for article in articles:
+                day, memberships = self._memberships(article)
+                new = {(dimension, key, day): value for (dimension, key), value in memberships.items()}
+                old = set(self.conn.execute(
+                    "SELECT dimension, value_key, day FROM rollup_members WHERE news_id = ?",
+                    (article["news_id"],)
+                ).fetchall())
+                for dimension, key, old_day in old - new.keys():
+                    self.conn.execute(
+                        "DELETE FROM rollup_members WHERE dimension = ? AND value_key = ? AND day = ? AND news_id = ?",
+                        (dimension, key, old_day, article["news_id"])
+                    )
+                    self.conn.execute(
+                        "UPDATE rollup_counts SET article_count = article_count - 1 WHERE dimension = ? AND value_key = ? AND day = ?",
+                        (dimension, key, old_day)
+                    )
+                for (dimension, key, new_day), value in new.items():
+                    if (dimension, key, new_day) in old:
+                        continue
+                    self.conn.execute(
+                        "INSERT INTO rollup_members (dimension, value_key, day, news_id) VALUES (?, ?, ?, ?)",
+                        (dimension, key, new_day, article["news_id"])
+                    )
+                    self.conn.execute(
+                        """
+                        INSERT INTO rollup_counts (dimension, value_key, day, value, article_count) VALUES (?, ?, ?, ?, 1)
+                        ON CONFLICT (dimension, value_key, day) DO UPDATE SET article_count = article_count + 1
+                        """,
+                        (dimension, key, new_day, value)
+                    )
+            self.conn.execute("DELETE FROM rollup_counts WHERE article_count <= 0")
+            self.conn.commit()
+        self.logger.debug("%s: applied %d articles.", RollupStore.__name__, len(articles))
+
+        return
+
+
+    # recompute the rollups from every article in the article store.
+    def rebuild(self, batch_size: int = 500) -> None:
+        news_ids = self.article_store.search_news_ids()
+        for i in range(0, len(news_ids), batch_size):
+            self.apply(articles=list(self.article_store.get_articles(news_ids=news_ids[i:i + batch_size]).values()))
+        self.logger.info(f"{RollupStore.__name__}: rebuilt rollups from {len(news_ids)} articles.")
+
+        return
+
+
+    def _day_conditions(self, start_date: str | None, end_date: str | None) -> tuple[str, list]:
+        conditions, params = [], []
+        if start_date:
+            conditions.append("day >= ?")
+            params.append(datetime.fromtimestamp(date_to_unix(start_date)).date().isoformat())
+        if end_date:
+            conditions.append("day <= ?")
+            params.append(datetime.fromtimestamp(date_to_unix(end_date)).date().isoformat())
+
+        return "".join(f" AND {condition}" for condition in conditions), params
+
+
+    # counts (and optional trends) per organization or keyword, straight from the rollup tables.
+    def aggregate_records(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        group_by: str = "organization",
+        name: str | None = None,
+        interval: str | None = None,
+        limit: int = 20,
+        with_ids: bool = False
+    ) -> dict:
+        if group_by not in DIMENSIONS:
+            raise ValueError(f"Unsupported group_by '{group_by}', expected one of {list(DIMENSIONS)}.")
+        if interval is not None and interval not in INTERVALS:
+            raise ValueError(f"Unsupported interval '{interval}', expected one of {INTERVALS}.")
+        day_sql, day_params = self._day_conditions(start_date=start_date, end_date=end_date)
+        name_sql, name_params = (" AND value_key LIKE ?", [f"%{_value_key(name)}%"]) if name and group_by != "all" else ("", [])
+
+        with self.lock:
+            # press releases in at least one matching group, each counted once.
+            total = self.conn.execute(
+                f"SELECT COUNT(DISTINCT news_id) FROM rollup_members WHERE dimension = ?{day_sql}{name_sql}",
+                [group_by, *day_params, *name_params]
+            ).fetchone()[0]
+            rows = self.conn.execute(
+                f"SELECT value_key, value, day, article_count FROM rollup_counts WHERE dimension = ?{day_sql}{name_sql}",
+                [group_by, *day_params, *name_params]
+            ).fetchall()
+
+        counts: dict[str, int] = defaultdict(int)
+        names: dict[str, str] = {}
+        series: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for key, value, day, article_count in rows:
+            counts[key] += article_count
+            names.setdefault(key, value)
+            if interval:
+                series[key][_period(day, interval)] += article_count
+        top = sorted(counts, key=lambda key: (-counts[key], key))[:max(1, limit)]
+
+        groups = []
+        for key in top:
+            group = {"name": names[key], "count": counts[key]}
+            if interval:
+                group["series"] = [{"period": period, "count": count} for period, count in sorted(series[key].items())]
+            groups.append(group)
+        if with_ids:
+            with self.lock:
+                for key, group in zip(top, groups):
+                    group["news_ids"] = [row[0] for row in self.conn.execute(
+                        f"SELECT news_id FROM rollup_members WHERE dimension = ? AND value_key = ?{day_sql} ORDER BY day DESC, news_id DESC LIMIT ?",
+                        [group_by, key, *day_params, self.max_ids]
+                    ).fetchall()]
+
+        return {
+            "total": total,
+            "group_by": group_by,
+            "start_date": start_date,
+            "end_date": end_date,
+            "distinct_groups": len(counts),
+            "groups": groups
+        }
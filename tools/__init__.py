@@ -0,0 +1,3 @@
+# .env is loaded once, when the package is first imported; modules only read os.getenv.
+from dotenv import load_dotenv
+load_dotenv()
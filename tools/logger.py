@@ -1,39 +1,91 @@
 import logging
+import logging.handlers
+import atexit
+import copy
+import json
+import queue
 import os
 from datetime import datetime
 
-from dotenv import load_dotenv
-load_dotenv()
+
+# attributes every LogRecord has; anything else was passed through `extra=`.
+RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record, self.datefmt),
+            "name": record.name,
+            "level": record.levelname,
+            "message": record.getMessage()
+        }
+        payload.update({key: value for key, value in vars(record).items() if key not in RESERVED_ATTRS})
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+# QueueHandler.prepare formats the record on the calling thread; this one hands the raw record
+# to the listener, so %-interpolation, the formatter and tracebacks are all rendered there.
+# Arguments are rendered after the call returns, so callers must not mutate them afterwards.
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return copy.copy(record)
 
 
 class Logger:
+    # the background listener is shared by every Logger in the process.
+    listener: logging.handlers.QueueListener | None = None
+
     def __init__(self, name: str):
         """
-        Initialize a logger using logging.basicConfig.
+        Initialize a logger writing through a background queue listener.
 
         :param name: Name of the logger (usually __name__).
-        :param log_file: Optional file path to save logs.
-        :param level: Logging level (default INFO).
+        Log file directory, level, format ("text" or "json") and whether
+        writes happen on a background thread come from .env.
         """
         # Generate a filename with current datetime
         self.log_filename = f"app_log_{datetime.now().strftime('%Y-%m-%d_%H_%M_%S')}.log"
         self.log_filepath = os.getenv("logpath")
         self.log_level = os.getenv("log_level")
+        self.log_output = os.getenv("log_output_format", "text")
+        self.log_async = os.getenv("log_async", "true").lower() == "true"
         self.log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         self.date_format = "%Y-%m-%d %H:%M:%S"
-        
-        logging.basicConfig(
-                level=self.log_level,
-                format=self.log_format,
-                datefmt=self.date_format,
-                handlers=[
-                    logging.FileHandler(os.path.join(self.log_filepath, self.log_filename))
-                ]
-        )
+
+        if Logger.listener is None and not logging.getLogger().handlers:
+            self._configure_root()
         self.logger = logging.getLogger(name)
 
+    def _configure_root(self) -> None:
+        if self.log_output == "json":
+            self.log_filename = self.log_filename.replace(".log", ".jsonl")
+            formatter = JsonLinesFormatter(datefmt=self.date_format)
+        else:
+            formatter = logging.Formatter(fmt=self.log_format, datefmt=self.date_format)
+        file_handler = logging.FileHandler(os.path.join(self.log_filepath, self.log_filename), encoding="utf-8")
+        file_handler.setFormatter(formatter)
+
+        root = logging.getLogger()
+        root.setLevel(self.log_level)
+        if not self.log_async:
+            root.addHandler(file_handler)
+            return
+
+        # callers only enqueue records; file I/O and formatting happen on the listener thread.
+        log_queue: queue.Queue = queue.Queue(-1)
+        root.addHandler(DeferredQueueHandler(log_queue))
+        Logger.listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        Logger.listener.start()
+        atexit.register(Logger.listener.stop)
+
     def get_logger(self):
         """Return the configured logger instance."""
         self.logger.info("Class Logger initiated.")
-        
+
         return self.logger